@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+import catalog_index
+import logs
+import metrics
+import specs
+
+# Whole-sheet matcher: scores every row against every product in one pass.
+# Rows are scored a chunk at a time: the chunk's distinct normalized terms
+# are resolved against the catalog index (memoized there) into a term x
+# product hit matrix, and the chunk's row x term count matrix multiplied by it
+# gives the row x product scores, from which the best product per row is
+# picked with the same rules as best_match (earliest product wins ties,
+# min_match threshold, or every term present in all-terms mode). Chunks are
+# cut so that both matrices stay under MAX_CHUNK_CELLS.
+# usage:
+#     index = catalog_index.build_index(products, 'name', normalize)
+#     matches = match_rows(df, ['Cpu', 'Ram', 'SSD'], index, normalize)
+#     matches.loc[idx, 'match']  -> product position in index['products'], or -1
+
+# Upper bound on the row x product and term x product cells of one chunk
+MAX_CHUNK_CELLS = 5_000_000
+
+log = logs.get_logger(__name__)
+
+
+def row_terms(rows, feature_columns, normalize, name_column='Product name'):
+    # Same terms best_match builds: the normalized product name (unless
+    # name_column is None) plus every truthy feature cell, normalized
+    terms = {}
+    if name_column is not None:
+        terms[name_column] = rows[name_column].map(normalize)
+    for col in feature_columns:
+        terms[col] = rows[col].map(lambda value: normalize(value) if value else None)
+    return pd.DataFrame(terms, index=rows.index)
+
+
+def match_rows(rows, feature_columns, index, normalize, name_column='Product name',
+               min_match=2, require_all=False):
+    n_rows = len(rows)
+    n_products = len(index['products'])
+    best = np.full(n_rows, -1, dtype=np.int64)
+    best_score = np.zeros(n_rows, dtype=np.int64)
+    if n_rows == 0 or n_products == 0:
+        return pd.DataFrame({'match': best, 'score': best_score}, index=rows.index)
+
+    terms = row_terms(rows, feature_columns, normalize, name_column)
+    vocab = [term for term in pd.unique(terms.to_numpy().ravel()) if term is not None]
+    term_ids = {term: i for i, term in enumerate(vocab)}
+
+    # Term id of each row's name/feature cell, -1 for empty cells
+    codes = terms.apply(lambda col: col.map(term_ids)).to_numpy(dtype=np.float64, na_value=-1).astype(np.int64)
+    n_terms = (codes >= 0).sum(axis=1)
+
+    # Rows (and distinct terms) per chunk
+    limit = max(1, MAX_CHUNK_CELLS // n_products)
+    start = 0
+    while start < n_rows:
+        stop = min(start + limit, n_rows)
+        # Shrink the chunk until its distinct terms fit the limit as well
+        block = codes[start:stop]
+        chunk_terms, first = np.unique(block.ravel(), return_index=True)
+        first_rows = first[chunk_terms >= 0] // block.shape[1]
+        seen_terms = np.cumsum(np.bincount(first_rows, minlength=stop - start))
+        stop = start + max(1, int(np.searchsorted(seen_terms, limit, side='right')))
+        block = codes[start:stop]
+        chunk_terms = np.unique(block[block >= 0])
+
+        hits = np.zeros((len(chunk_terms), n_products), dtype=np.float32)
+        for i, term_id in enumerate(chunk_terms):
+            hits[i, catalog_index.containing(index, vocab[term_id])] = 1
+        counts = np.zeros((stop - start, len(chunk_terms)), dtype=np.float32)
+        row_ids, col_ids = np.nonzero(block >= 0)
+        np.add.at(counts, (row_ids, np.searchsorted(chunk_terms, block[row_ids, col_ids])), 1)
+        scores = counts @ hits
+        if require_all:
+            complete = scores == n_terms[start:stop, None]
+            found = complete.any(axis=1)
+            best[start:stop] = np.where(found, complete.argmax(axis=1), -1)
+            best_score[start:stop] = np.where(found, n_terms[start:stop], 0)
+        else:
+            top = scores.max(axis=1)
+            found = (top > 0) & (top >= min_match)
+            best[start:stop] = np.where(found, scores.argmax(axis=1), -1)
+            best_score[start:stop] = top
+        start = stop
+    return pd.DataFrame({'match': best, 'score': best_score}, index=rows.index)
+
+
+def matched_products(matches, index):
+    # {row index: product dict or None}
+    products = index['products']
+    return {idx: (products[pos] if pos >= 0 else None) for idx, pos in matches['match'].items()}
+
+
+def match_catalog(rows, products, key, feature_columns, normalize, name_column='Product name',
+                  min_match=2, require_all=False):
+    # Rows whose cells give a complete spec key (see specs.py) are first matched
+    # by an exact hash join, so a partial substring hit cannot beat an exact one.
+    # Rows the join leaves unmatched (incomplete key, or titles the extractor
+    # reads differently) fall back to substring scoring.
+    # Returns {row index: product dict or None}
+    use_color = 'Color' in feature_columns
+    columns = ([name_column] if name_column is not None else []) + list(feature_columns)
+    with metrics.span('match'):
+        joined = specs.join_rows(rows, products, key, columns, use_color)
+        matches = {idx: (products[pos] if pos is not None else None) for idx, pos in joined.items()}
+        pending = [idx for idx, product in matches.items() if product is None]
+        fallback = None
+        if pending:
+            index = catalog_index.build_index(products, key, normalize)
+            fallback = match_rows(rows.loc[pending], feature_columns, index, normalize, name_column,
+                                  min_match=min_match, require_all=require_all)
+            matches.update(matched_products(fallback, index))
+    if log.isEnabledFor(logs.TRACE):
+        _trace_matches(rows, joined, fallback, matches, key, feature_columns, normalize, name_column)
+    metrics.count('rows_matched', sum(1 for product in matches.values() if product))
+    metrics.count('rows_unmatched', sum(1 for product in matches.values() if not product))
+    return matches
+
+
+def _trace_matches(rows, joined, scored, matches, key, feature_columns, normalize, name_column):
+    # TRACE: how each row was matched; terms and winning score for the scored ones
+    for idx, pos in joined.items():
+        if pos is not None:
+            log.log(logs.TRACE, "Row %s: spec key join -> %s", idx + 1, matches[idx][key])
+    if scored is None:
+        return
+    terms = row_terms(rows.loc[scored.index], feature_columns, normalize, name_column)
+    for idx, values, score in zip(scored.index, terms.itertuples(index=False), scored['score']):
+        product = matches[idx]
+        log.log(logs.TRACE, "Row %s: terms %s, best score %d -> %s", idx + 1,
+                [term for term in values if term is not None], score, product[key] if product else None)
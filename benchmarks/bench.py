@@ -0,0 +1,294 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Offline benchmarks for the scrapers, replaying the pages in fixtures/:
+#   parse  - per-page parse time for every site's listing/search/product page,
+#            with the configured regions and as a full html.parser tree
+#   match  - best_match latency and whole-sheet matcher throughput against
+#            synthetic catalogs of growing size (up to 100k titles)
+#   e2e    - rows/sec of each site's scrape_rows with HTTP served from fixtures,
+#            either in-process or (--mock) through the real HTTP stack against
+#            mock_shop.py with the given latency, errors and throttling
+# Results are written as JSON so runs of different versions can be diffed.
+# usage: python benchmarks/bench.py [--only parse match] [--quick] [--output results.json]
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+# Keep the scrapers' on-disk state (HTTP/query caches, crawl catalogs,
+# escalations) out of the working tree for the run
+os.environ.setdefault('SCRAPER_CACHE_DIR', tempfile.mkdtemp(prefix='scraper-bench-'))
+os.environ.setdefault('SCRAPER_INCREMENTAL', '0')
+os.environ.setdefault('SCRAPER_HTTP_CACHE', '0')
+os.environ.setdefault('SCRAPER_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd  # noqa: E402
+import requests  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+import batch_match  # noqa: E402
+import catalog_index  # noqa: E402
+import html_parse  # noqa: E402
+import http_client  # noqa: E402
+import make_fixtures  # noqa: E402
+import metrics  # noqa: E402
+import mock_shop  # noqa: E402
+import micropple_full_scrape  # noqa: E402
+import mysurface_full_scrape  # noqa: E402
+import parsanme_full_scrape  # noqa: E402
+import query_cache  # noqa: E402
+import raayaatech_full_scrape  # noqa: E402
+import sheet  # noqa: E402
+import site_engine  # noqa: E402
+import sites  # noqa: E402
+import surfaceiran_full_scrape  # noqa: E402
+import surfaceiran_scraper  # noqa: E402
+import surfacekar_full_scrape  # noqa: E402
+import yasinrayan_full_scrape  # noqa: E402
+
+MATCH_SIZES = [1_000, 10_000, 100_000]
+QUICK_MATCH_SIZES = [1_000, 10_000]
+MATCH_QUERIES = 200
+E2E_ROWS = 100
+
+
+def _timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+# --- parse ---
+
+def _listing_case(page, spec):
+    regions = spec['regions'] + (html_parse.PAGINATION_REGIONS if 'listing' in spec else [])
+    return (spec['site'], page, 'cards', regions, functools.partial(site_engine.parse_cards, spec))
+
+
+def _price_val(soup):
+    tag = soup.select_one('.priceVal')
+    return tag.get_text(strip=True) if tag else ''
+
+
+def _product_page_price(soup):
+    page = sites.MYSURFACE['product_page']
+    return [tag.get_text(strip=True) for tag in soup.select_one(page['containers'][0]).select(page['amount'])]
+
+
+def _swatches(soup):
+    return [tag.get_text(strip=True) for tag in soup.select(sites.YASINRAYAN['colors']['selector'])]
+
+
+# (site, fixture page, what is read, regions, parse(soup))
+PARSE_CASES = [
+    _listing_case('category.html', sites.MICROPPLE),
+    _listing_case('category.html', sites.MYSURFACE),
+    _listing_case('category.html', sites.MYSURFACE_PRO),
+    _listing_case('category.html', sites.PARSANME),
+    _listing_case('category.html', sites.SURFACEIRAN),
+    _listing_case('search.html', sites.YASINRAYAN),
+    _listing_case('search.html', sites.SURFACEKAR),
+    _listing_case('search.html', sites.RAAYAATECH),
+    ('mysurface.ir', 'product.html', 'price', None, _product_page_price),
+    ('yasinrayan.com', 'product.html', 'colors', sites.YASINRAYAN['colors']['regions'], _swatches),
+    ('surfaceiran.com', 'product.html', 'price', ['.priceVal'], _price_val),
+]
+
+
+def bench_parse(repeat):
+    results = []
+    for site, page, reads, regions, parse in PARSE_CASES:
+        html = make_fixtures.read_fixture(site, page)
+        seconds, parsed = _timed(lambda: parse(html_parse.parse(html, regions)), repeat)
+        full_seconds, _ = _timed(lambda: parse(BeautifulSoup(html, 'html.parser')), repeat)
+        results.append({
+            'site': site,
+            'page': page,
+            'reads': reads,
+            'bytes': len(html.encode('utf-8')),
+            'items': len(parsed) if isinstance(parsed, list) else int(bool(parsed)),
+            'ms_per_page': round(seconds * 1000, 3),
+            'pages_per_sec': round(1 / seconds, 1),
+            'full_tree_ms_per_page': round(full_seconds * 1000, 3),
+        })
+    return results
+
+
+# --- match ---
+
+def _sheet_rows(rng, count):
+    rows = []
+    for _ in range(count):
+        _, family, generations = rng.choice(make_fixtures.FAMILIES)
+        cpu = rng.choice(make_fixtures.CPUS).replace('Core ', '')
+        ram, ssd = rng.choice(make_fixtures.MEMORY)
+        rows.append({'Product name': f'surface {family.lower()} {rng.choice(generations)}', 'Cpu': cpu,
+                     'Ram': f'{ram}GB', 'SSD': ssd.replace('TB', 'T'), 'Color': rng.choice(make_fixtures.COLORS)[0]})
+    return pd.DataFrame(rows, columns=sheet.INPUT_COLUMNS)
+
+
+def bench_match(sizes):
+    normalize = site_engine.normalize
+    features = ['Cpu', 'Ram', 'SSD']
+    results = []
+    for size in sizes:
+        rng = random.Random(size)
+        products = make_fixtures.catalog(rng, size)
+        rows = _sheet_rows(rng, MATCH_QUERIES)
+
+        build_seconds, index = _timed(lambda: catalog_index.build_index(products, 'title', normalize), 1)
+        terms = [[normalize(row['Product name'])] + [normalize(row[col]) for col in features]
+                 for _, row in rows.iterrows()]
+        start = time.perf_counter()
+        for search_terms in terms:
+            catalog_index.best_match(index, search_terms)
+        best_match_seconds = (time.perf_counter() - start) / len(terms)
+
+        fresh = catalog_index.build_index(products, 'title', normalize)
+        match_rows_seconds, _ = _timed(lambda: batch_match.match_rows(rows, features, fresh, normalize), 1)
+        join_seconds, matches = _timed(
+            lambda: batch_match.match_catalog(rows, products, 'title', features, normalize), 1)
+        results.append({
+            'catalog_size': size,
+            'queries': len(rows),
+            'build_index_s': round(build_seconds, 4),
+            'best_match_us': round(best_match_seconds * 1e6, 1),
+            'match_rows_rows_per_sec': round(len(rows) / match_rows_seconds, 1),
+            'match_catalog_rows_per_sec': round(len(rows) / join_seconds, 1),
+            'match_catalog_matched': sum(1 for match in matches.values() if match),
+        })
+    return results
+
+
+# --- end to end ---
+
+E2E_SITES = [
+    micropple_full_scrape, mysurface_full_scrape, parsanme_full_scrape, yasinrayan_full_scrape,
+    surfacekar_full_scrape, raayaatech_full_scrape, surfaceiran_full_scrape, surfaceiran_scraper,
+]
+
+
+def fixture_get(url, params=None, headers=None, timeout=20, cache=True, ttl=None):
+    # Stand-in for http_client.get that answers from fixtures/
+    if params:
+        url = requests.Request('GET', url, params=params).prepare().url
+    resp = requests.Response()
+    resp.url = url
+    resp.encoding = 'utf-8'
+    try:
+        resp._content = make_fixtures.read_fixture(*make_fixtures.fixture_for(url)).encode('utf-8')
+        resp.status_code = 200
+    except OSError:
+        resp._content = b''
+        resp.status_code = 404
+    return resp
+
+
+def _stage_seconds():
+    totals = {}
+    for entry in metrics.snapshot()['spans']:
+        totals[entry['stage']] = round(totals.get(entry['stage'], 0) + entry['seconds'], 3)
+    return totals
+
+
+def bench_e2e(row_count, shop=None):
+    rows = _sheet_rows(random.Random(row_count), row_count)
+    real_get, real_base_url = http_client.get, http_client.BASE_URL
+    server = None
+    if shop is None:
+        http_client.get = fixture_get
+    else:
+        server = mock_shop.serve(shop, port=0)
+        http_client.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    results = []
+    try:
+        for module in E2E_SITES:
+            query_cache.clear_memory()
+            metrics.reset()
+            before = dict(shop.stats) if shop is not None else {}
+            start = time.perf_counter()
+            with metrics.site_context(module.SITE):
+                scraped = list(module.scrape_rows(rows))
+            seconds = time.perf_counter() - start
+            results.append({
+                'site': module.SITE,
+                'module': module.__name__,
+                'rows': len(scraped),
+                'priced_rows': sum(1 for _, result in scraped if result.get('price')),
+                'seconds': round(seconds, 3),
+                'rows_per_sec': round(len(scraped) / seconds, 1),
+                'stage_seconds': _stage_seconds(),
+            })
+            if shop is not None:
+                results[-1]['mock_statuses'] = {str(status): count - before.get((site, status), 0)
+                                                for (site, status), count in sorted(shop.stats.items())
+                                                if count > before.get((site, status), 0)}
+    finally:
+        http_client.get, http_client.BASE_URL = real_get, real_base_url
+        if server is not None:
+            server.shutdown()
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline scraper benchmarks.')
+    parser.add_argument('--only', nargs='+', choices=['parse', 'match', 'e2e'], default=['parse', 'match', 'e2e'])
+    parser.add_argument('--quick', action='store_true', help='fewer repeats and no 100k catalog')
+    parser.add_argument('--repeat', type=int, default=None, help='parse repeats per page')
+    parser.add_argument('--rows', type=int, default=E2E_ROWS, help='sheet rows for the e2e runs')
+    parser.add_argument('--mock', action='store_true', help='run e2e over HTTP against a local mock_shop')
+    parser.add_argument('--latency', type=float, default=50, help='mock: ms per response')
+    parser.add_argument('--jitter', type=float, default=20, help='mock: +/- ms on the latency')
+    parser.add_argument('--error-rate', type=float, default=0, help='mock: share of 503 answers')
+    parser.add_argument('--rps', type=float, default=None, help='mock: per-shop requests/second before 429s')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = {
+        'meta': {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'html_parser': html_parse.PARSER,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+    }
+    if 'parse' in args.only:
+        report['parse'] = bench_parse(args.repeat or (3 if args.quick else 20))
+    if 'match' in args.only:
+        report['match'] = bench_match(QUICK_MATCH_SIZES if args.quick else MATCH_SIZES)
+    if 'e2e' in args.only:
+        shop = None
+        if args.mock:
+            shop = mock_shop.Shop(args.latency / 1000, args.jitter / 1000, args.error_rate, rps=args.rps, seed=0)
+            report['meta']['mock'] = {'latency_ms': args.latency, 'jitter_ms': args.jitter,
+                                      'error_rate': args.error_rate, 'rps': args.rps}
+        report['e2e'] = bench_e2e(args.rows, shop)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+import json
+import os
+import random
+import re
+from urllib.parse import urlsplit
+
+# Writes the HTML/JSON fixtures bench.py replays. The pages are synthetic but
+# follow the markup each site's parser reads (WooCommerce/Woodmart cards for
+# micropple, yasinrayan and surfacekar, Flatsome for mysurface, and the custom
+# themes of parsanme, raayaatech and surfaceiran), wrapped in the kind of
+# theme chrome (mega menus, inline scripts, footers) that makes real pages
+# heavy. Regenerate after a site changes its markup; output is deterministic.
+# fixture_for() maps a shop URL to the fixture that stands in for it.
+# usage: python benchmarks/make_fixtures.py
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CARDS_PER_PAGE = 24
+# Listing pages served before the empty past-the-end page
+FIXTURE_PAGES = 3
+PAGE_NUMBER_RE = re.compile(r'(?:/page/|[?&]page=)(\d+)')
+
+PERSIAN_DIGITS = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
+FAMILIES = [('پرو', 'Pro', ['9', '10', '11']), ('لپ تاپ', 'Laptop', ['5', '6', '7']), ('گو', 'Go', ['3', '4'])]
+CPUS = ['Core i5', 'Core i7', 'Core Ultra 5', 'Core Ultra 7', 'Snapdragon X Plus', 'Snapdragon X Elite']
+MEMORY = [(8, '256GB'), (16, '256GB'), (16, '512GB'), (32, '1TB'), (64, '1TB')]
+COLORS = [('Platinum', 'پلاتینی'), ('Black', 'مشکی'), ('Sapphire', 'آبی (Sapphire)'), ('Dune', 'شنی طلایی')]
+
+
+def catalog(rng, count):
+    items = []
+    for i in range(count):
+        fa_family, en_family, generations = rng.choice(FAMILIES)
+        generation = rng.choice(generations)
+        cpu = rng.choice(CPUS)
+        ram, ssd = rng.choice(MEMORY)
+        color_en, color_fa = rng.choice(COLORS)
+        price = rng.randrange(60_000, 320_000) * 1000
+        if i % 2:
+            title = f'سرفیس {fa_family} {generation} {cpu} رم {ram}GB حافظه {ssd} {color_fa}'
+        else:
+            title = f'Surface {en_family} {generation} {cpu} {ram}GB {ssd} {color_en}'
+        items.append({'title': title, 'slug': f'surface-{en_family.lower()}-{generation}-{i}',
+                      'price': price, 'colors': [color_fa] + [c[1] for c in rng.sample(COLORS, 2)]})
+    return items
+
+
+def toman(price, persian=True):
+    text = f'{price:,}'
+    return text.translate(PERSIAN_DIGITS) if persian else text
+
+
+def chrome(body, title='فروشگاه'):
+    menu = ''.join(
+        f'<li class="menu-item menu-item-has-children"><a href="/category/{i}/">دسته {i}</a><ul class="sub-menu">'
+        + ''.join(f'<li class="menu-item"><a href="/category/{i}/{j}/">زیر دسته {j}</a></li>' for j in range(12))
+        + '</ul></li>'
+        for i in range(24))
+    script = '<script>var wc_params = ' + json.dumps({f'k{i}': 'x' * 40 for i in range(300)}) + ';</script>'
+    styles = '<style>' + ''.join(f'.c{i}{{margin:{i}px;color:#{i:06x}}}' for i in range(400)) + '</style>'
+    footer = '<footer class="site-footer">' + ''.join(
+        f'<div class="widget"><h4>ستون {i}</h4><p>{"متن پاورقی " * 40}</p></div>' for i in range(6)) + '</footer>'
+    return (f'<!DOCTYPE html><html lang="fa" dir="rtl"><head><meta charset="utf-8"><title>{title}</title>'
+            f'{styles}{script}</head><body class="archive"><header class="site-header"><nav class="main-nav">'
+            f'<ul class="menu">{menu}</ul></nav></header><main class="site-main">{body}</main>{footer}'
+            f'{script}</body></html>')
+
+
+def woodmart_cards(items, base):
+    return ''.join(f'''
+<div class="product-grid-item product wd-hover-base type-product status-publish instock">
+  <div class="product-wrapper">
+    <div class="product-element-top wd-quick-shop">
+      <a href="{base}/product/{it['slug']}/" class="product-image-link"><img src="{base}/img/{it['slug']}.webp" alt=""></a>
+      <div class="wrapp-buttons"><div class="wd-buttons"><a href="#" class="button">مقایسه</a></div></div>
+    </div>
+    <div class="product-element-bottom">
+      <h3 class="wd-entities-title"><a href="{base}/product/{it['slug']}/" title="{it['title']}">{it['title']}</a></h3>
+      <div class="wd-product-cats"><a href="{base}/category/surface/">سرفیس</a></div>
+      <span class="price"><span class="woocommerce-Price-amount amount"><bdi>{toman(it['price'])}&nbsp;<span class="woocommerce-Price-currencySymbol">تومان</span></bdi></span></span>
+    </div>
+  </div>
+</div>''' for it in items)
+
+
+def woodmart_pagination(base, last):
+    links = ''.join(f'<li><a class="page-numbers" href="{base}/page/{p}/">{p}</a></li>' for p in range(2, last + 1))
+    return (f'<nav class="woocommerce-pagination"><ul class="page-numbers"><li><span class="page-numbers current">1</span></li>'
+            f'{links}<li><a class="next page-numbers" href="{base}/page/2/">&larr;</a></li></ul></nav>')
+
+
+def woodmart_listing(items, base, paginate):
+    body = f'<div class="products elements-grid wd-products-holder">{woodmart_cards(items, base)}</div>'
+    if paginate:
+        body += woodmart_pagination(base + '/product-category/surface', 3)
+    return chrome(body)
+
+
+def woodmart_product(item):
+    swatches = ''.join(f'<div class="wd-swatch wd-text wd-tooltip"><span class="wd-swatch-text">{c}</span></div>'
+                       for c in item['colors'])
+    body = (f'<div class="product type-product"><h1 class="product_title">{item["title"]}</h1>'
+            f'<p class="price"><span class="woocommerce-Price-amount amount">{toman(item["price"])}</span></p>'
+            f'<div class="wd-swatches-product wd-swatches-single">{swatches}</div>'
+            f'<div class="woocommerce-Tabs-panel">{"<p>مشخصات فنی محصول</p>" * 200}</div></div>')
+    return chrome(body, item['title'])
+
+
+def flatsome_listing(items, base):
+    cards = ''.join(f'''
+<div class="product-small col has-hover product type-product instock">
+  <div class="col-inner"><div class="product-small box">
+    <div class="box-image"><a href="{base}/store/product/{it['slug']}/" aria-label="{it['title']}"><img src="{base}/img/{it['slug']}.webp"></a></div>
+    <div class="box-text box-text-products text-center">
+      <div class="title-wrapper"><p class="name product-title woocommerce-loop-product__title"><a href="{base}/store/product/{it['slug']}/" class="woocommerce-LoopProduct-link woocommerce-loop-product__link">{it['title']}</a></p></div>
+      <div class="price-wrapper"><span class="price"><del><span class="woocommerce-Price-amount amount">{toman(it['price'] + 5_000_000)}</span></del> <ins><span class="woocommerce-Price-amount amount">{toman(it['price'])}</span></ins></span></div>
+    </div>
+  </div></div>
+</div>''' for it in items)
+    body = (f'<div class="products row row-small large-columns-4">{cards}</div>'
+            + woodmart_pagination(base + '/surface-pro', 3))
+    return chrome(body)
+
+
+def flatsome_product(item):
+    body = (f'<div class="product-main"><h1 class="product-title">{item["title"]}</h1>'
+            f'<p class="price product-page-price price-on-sale"><del><span class="woocommerce-Price-amount amount">'
+            f'{toman(item["price"] + 5_000_000)}</span></del> <ins><span class="woocommerce-Price-amount amount">'
+            f'{toman(item["price"])}</span></ins></p>{"<p>توضیحات</p>" * 200}</div>')
+    return chrome(body, item['title'])
+
+
+def parsanme_listing(items, base):
+    cards = ''.join(f'''
+<div class="col-lg-3 col-md-4 col-6 product-card"><div class="container">
+  <a class="image" href="/product/PI-{1000 + i}/{it['slug']}"><img src="/img/{i}.webp"></a>
+  <a class="title ellipsis-2" href="/product/PI-{1000 + i}/{it['slug']}" title="{it['title']}">{it['title']}</a>
+  <div class="price-container"><del class="old-price">{toman(it['price'] + 3_000_000, False)}</del><strong class="price">{toman(it['price'], False)}</strong><span>تومان</span></div>
+</div></div>''' for i, it in enumerate(items))
+    body = (f'<div class="container-fluid"><div class="row">{cards}</div>'
+            f'<ul class="pagination"><li><a href="{base}?page=2">2</a></li><li><a href="{base}?page=3">3</a></li>'
+            f'<li><a aria-label="Next" href="{base}?page=2">&raquo;</a></li></ul></div>')
+    return chrome(body)
+
+
+def raayaatech_search(items):
+    cards = ''.join(f'''
+<div class="col-xl-3 col-lg-4 col-md-4 col-6 price_on"><div class="product-box">
+  <a class="image" href="/product/{5877000 + i}"><img src="/img/{i}.webp"></a>
+  <a class="title overflow-hidden" href="/product/{5877000 + i}" title="{it['title']}">{it['title']}</a>
+  <div class="price-area"><span class="price">{toman(it['price'], False)}</span> <span class="unit">تومان</span></div>
+</div></div>''' for i, it in enumerate(items))
+    return chrome(f'<div class="row search-results">{cards}</div>')
+
+
+def surfaceiran_listing(items):
+    cards = ''.join(f'''
+<div class="productItem"><a href="/p/{i:024x}"><img src="/img/{i}.webp"></a>
+  <div class="productname">{it['title']}</div>
+  <span class="price">{toman(it['price'] * 10, False)} ريال</span>
+</div>''' for i, it in enumerate(items))
+    return chrome(f'<div class="productList">{cards}</div>')
+
+
+def surfaceiran_product(item):
+    body = (f'<div class="productDetail"><h1>{item["title"]}</h1><div class="priceBox">'
+            f'<span class="priceVal">{toman(item["price"] * 10, False)}</span> ريال</div>{"<p>توضیحات</p>" * 200}</div>')
+    return chrome(body, item['title'])
+
+
+def surfaceiran_api(items):
+    # Short list rows; every third one has no price and needs the detail JSON
+    rows = [{'_id': f'{i:024x}', 'productname': it['title']} for i, it in enumerate(items)]
+    for i, (row, it) in enumerate(zip(rows, items)):
+        if i % 3:
+            row['priceVal'] = it['price'] * 10
+    return json.dumps({'rows': rows, 'count': len(rows)}, ensure_ascii=False)
+
+
+def surfaceiran_detail(item):
+    return json.dumps({'product': {'_id': f'{0:024x}', 'productname': item['title'], 'priceVal': item['price'] * 10}},
+                      ensure_ascii=False)
+
+
+def store_products(items, base, category_slugs):
+    # WooCommerce Store API /products; every third product is a variable one
+    # with a price range, colors are its variation attribute
+    products = []
+    for i, it in enumerate(items):
+        prices = {'price': str(it['price']), 'regular_price': str(it['price']), 'sale_price': str(it['price']),
+                  'currency_code': 'IRT', 'currency_symbol': 'تومان', 'currency_minor_unit': 0, 'price_range': None}
+        if i % 3 == 0:
+            prices['price_range'] = {'min_amount': str(it['price']), 'max_amount': str(it['price'] + 4_000_000)}
+        products.append({
+            'id': 5000 + i, 'name': it['title'], 'slug': it['slug'], 'permalink': f"{base}/product/{it['slug']}/",
+            'type': 'variable' if i % 3 == 0 else 'simple', 'is_in_stock': True, 'prices': prices,
+            'categories': [{'id': 40 + i % len(category_slugs), 'slug': category_slugs[i % len(category_slugs)]}],
+            'attributes': [{'id': 1, 'name': 'رنگ', 'taxonomy': 'pa_color', 'has_variations': True,
+                            'terms': [{'id': 90 + j, 'name': color, 'slug': f'color-{j}'}
+                                      for j, color in enumerate(it['colors'])]}],
+        })
+    return json.dumps(products, ensure_ascii=False)
+
+
+def store_categories(category_slugs):
+    return json.dumps([{'id': 40 + i, 'name': slug, 'slug': slug, 'count': 0}
+                       for i, slug in enumerate(category_slugs)], ensure_ascii=False)
+
+
+def fixture_for(url):
+    # (site dir, file name) of the page standing in for url
+    parts = urlsplit(url)
+    m = PAGE_NUMBER_RE.search(url)
+    site = parts.netloc.lower().removeprefix('www.')
+    if parts.path.startswith('/wp-json/wc/store/'):
+        if parts.path.endswith('/categories'):
+            return site, 'store_categories.json'
+        # One page of JSON holds the whole fixture catalog
+        return ('_shared', 'empty.json') if m and int(m.group(1)) > 1 else (site, 'store.json')
+    if m and int(m.group(1)) > FIXTURE_PAGES:
+        return '_shared', 'empty.html'
+    if 'getShortList' in parts.path:
+        return site, 'search.json'
+    if parts.path.startswith('/products/getProduct/'):
+        return site, 'product.json'
+    if 's=' in parts.query or parts.path.startswith('/search'):
+        return site, 'search.html'
+    if parts.path.startswith(('/product/', '/p/', '/store/product/')):
+        return site, 'product.html'
+    return site, 'category.html'
+
+
+def read_fixture(site, name):
+    with open(os.path.join(FIXTURES_DIR, site, name), encoding='utf-8') as fh:
+        return fh.read()
+
+
+def write(site, name, text):
+    path = os.path.join(FIXTURES_DIR, site, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(text)
+
+
+def main():
+    rng = random.Random(1404)
+    items = catalog(rng, CARDS_PER_PAGE)
+    write('micropple.ir', 'category.html', woodmart_listing(items, 'https://micropple.ir', paginate=True))
+    write('mysurface.ir', 'category.html', flatsome_listing(items, 'https://mysurface.ir'))
+    write('mysurface.ir', 'product.html', flatsome_product(items[0]))
+    write('parsanme.com', 'category.html', parsanme_listing(items, 'https://parsanme.com/store/surface-pro'))
+    for site, base in (('yasinrayan.com', 'https://www.yasinrayan.com'), ('surfacekar.com', 'https://surfacekar.com')):
+        write(site, 'search.html', woodmart_listing(items[:12], base, paginate=False))
+        write(site, 'product.html', woodmart_product(items[0]))
+    write('raayaatech.com', 'search.html', raayaatech_search(items[:12]))
+    write('surfaceiran.com', 'category.html', surfaceiran_listing(items))
+    write('surfaceiran.com', 'product.html', surfaceiran_product(items[0]))
+    write('surfaceiran.com', 'search.json', surfaceiran_api(items))
+    write('surfaceiran.com', 'product.json', surfaceiran_detail(items[0]))
+    for site, base, categories in (
+            ('micropple.ir', 'https://micropple.ir', ['tablet-microsoft']),
+            ('mysurface.ir', 'https://mysurface.ir', ['surface-pro', 'surface-laptop', 'surface-go']),
+            ('yasinrayan.com', 'https://www.yasinrayan.com', ['surface']),
+            ('surfacekar.com', 'https://surfacekar.com', ['surface'])):
+        write(site, 'store.json', store_products(items, base, categories))
+        write(site, 'store_categories.json', store_categories(categories))
+    # Past-the-last-page listing, and the catalog bench.py derives sheet rows from
+    write('_shared', 'empty.html', chrome('<div class="products"></div>'))
+    write('_shared', 'empty.json', '[]')
+    write('_shared', 'catalog.json', json.dumps(items, ensure_ascii=False, indent=1))
+    print(f'Fixtures written to {FIXTURES_DIR}')
+
+
+if __name__ == '__main__':
+    main()
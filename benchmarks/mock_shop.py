@@ -0,0 +1,123 @@
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import make_fixtures
+
+# Local stand-in for the shops, serving the fixture pages under their real URL
+# shapes (/page/N/, ?page=N, /?s=...&post_type=product, /search?q=,
+# /products/getShortList?search=) with configurable latency, jitter, errors
+# and 429 throttling. Requests arrive as /<shop host>/<path>, which is what
+# http_client sends when SCRAPER_BASE_URL (or run_all --base-url) points here.
+# usage:
+#     python benchmarks/mock_shop.py --latency 200 --jitter 100 --error-rate 0.02 --rps 5
+#     python run_all.py --base-url http://127.0.0.1:8765 --sheet /tmp/copy.xlsx
+
+DEFAULT_PORT = 8765
+
+
+class Shop:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, rps=None, retry_after=1,
+                 seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rps = rps
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        # Per-site token buckets when rps is set: [tokens, last refill]
+        self.buckets = {}
+
+    def _over_limit(self, site):
+        if not self.rps:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.get(site, (self.rps, now))
+            tokens = min(self.rps, tokens + (now - updated) * self.rps)
+            allowed = tokens >= 1
+            self.buckets[site] = (tokens - 1 if allowed else tokens, now)
+            return not allowed
+
+    def respond(self, site, path_and_query):
+        # -> (status, headers, body bytes)
+        with self.lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            roll = self.random.random()
+        time.sleep(delay)
+        if self._over_limit(site) or roll < self.throttle_rate:
+            return 429, {'Retry-After': str(self.retry_after)}, b''
+        if roll < self.throttle_rate + self.error_rate:
+            return 503, {}, b'upstream error'
+        fixture_site, name = make_fixtures.fixture_for(f'https://{site}{path_and_query}')
+        try:
+            body = make_fixtures.read_fixture(fixture_site, name).encode('utf-8')
+        except OSError:
+            return 404, {}, b'no fixture'
+        content_type = 'application/json' if name.endswith('.json') else 'text/html; charset=UTF-8'
+        return 200, {'Content-Type': content_type}, body
+
+
+def make_handler(shop):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            site, _, rest = self.path.lstrip('/').partition('/')
+            status, headers, body = shop.respond(site, '/' + rest)
+            with shop.lock:
+                shop.stats[(site, status)] += 1
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(shop, port=DEFAULT_PORT, host='127.0.0.1'):
+    # Starts the server on a daemon thread and returns it (port 0 picks a free one)
+    server = ThreadingHTTPServer((host, port), make_handler(shop))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the benchmark fixtures as fake shops.')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0, help='ms added to every response')
+    parser.add_argument('--jitter', type=float, default=0, help='ms of uniform +/- variation on the latency')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of requests answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='share of requests answered with 429')
+    parser.add_argument('--rps', type=float, default=None, help='per-shop requests/second before 429s')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    shop = Shop(args.latency / 1000, args.jitter / 1000, args.error_rate, args.throttle_rate,
+                args.rps, args.retry_after, args.seed)
+    server = serve(shop, args.port)
+    print(f"Mock shops on http://127.0.0.1:{server.server_address[1]} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    for (site, status), count in sorted(shop.stats.items()):
+        print(f"{site:<20} {status} {count}")
+
+
+if __name__ == '__main__':
+    main()
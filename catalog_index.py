@@ -0,0 +1,97 @@
+from collections import Counter, defaultdict
+from itertools import chain
+
+# Inverted index over a site's product titles, built once per run.
+# Titles are normalized once with the site's normalize() and every character
+# trigram is mapped to the ids of the titles containing it. A search term can
+# only be a substring of titles that contain all of its trigrams, so matching
+# a row intersects a few posting lists and verifies only those candidates
+# instead of scanning the whole catalog. Results are identical to the plain
+# `term in title` scan, including its tie-breaking (earliest product wins).
+# usage:
+#     index = build_index(products, 'name', normalize)
+#     product, score = best_match(index, search_terms, min_match=2)
+
+NGRAM = 3
+
+
+def _grams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def build_index(products, key, normalize):
+    titles = [normalize(prod[key]) for prod in products]
+    postings = defaultdict(list)
+    for prod_id, title in enumerate(titles):
+        for gram in _grams(title):
+            postings[gram].append(prod_id)
+    return {
+        'products': products,
+        'key': key,
+        'titles': titles,
+        'postings': dict(postings),
+        'term_cache': {},
+    }
+
+
+def containing(index, term):
+    # Sorted ids of titles that contain term as a substring (memoized per term)
+    cached = index['term_cache'].get(term)
+    if cached is not None:
+        return cached
+    titles = index['titles']
+    if len(term) < NGRAM:
+        # Too short for a trigram lookup ('' matches everything, like `'' in title`)
+        candidates = range(len(titles))
+    else:
+        lists = []
+        for gram in _grams(term):
+            posting = index['postings'].get(gram)
+            if posting is None:
+                lists = None
+                break
+            lists.append(posting)
+        if lists is None:
+            candidates = ()
+        else:
+            lists.sort(key=len)
+            candidate_set = set(lists[0])
+            for posting in lists[1:]:
+                candidate_set.intersection_update(posting)
+                if not candidate_set:
+                    break
+            candidates = sorted(candidate_set)
+    result = [prod_id for prod_id in candidates if term in titles[prod_id]]
+    index['term_cache'][term] = result
+    return result
+
+
+def scores(index, search_terms):
+    # {product id: number of search terms found in its title}, for hits only
+    return Counter(chain.from_iterable(containing(index, term) for term in search_terms))
+
+
+def best_match(index, search_terms, min_match=2, require_all=False):
+    # Returns (product, score) or (None, best score seen)
+    products = index['products']
+    if require_all:
+        # First product whose title contains every term
+        matching = None
+        for term in search_terms:
+            ids = containing(index, term)
+            matching = set(ids) if matching is None else matching.intersection(ids)
+            if not matching:
+                return None, 0
+        if matching is None:
+            return (products[0], 0) if products else (None, 0)
+        return products[min(matching)], len(search_terms)
+
+    hits = scores(index, search_terms)
+    if not hits:
+        return None, 0
+    best_score = max(hits.values())
+    best_id = min(prod_id for prod_id, score in hits.items() if score == best_score)
+    if best_score >= min_match:
+        return products[best_id], best_score
+    return None, best_score
+
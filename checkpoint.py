@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+
+import http_client
+import logs
+
+# Per-site progress journal for long runs. Each result is appended to a small
+# JSONL file as soon as scrape_rows yields it, so an interrupted run keeps its
+# finished rows. With resume=True the journaled rows are replayed and only the
+# remaining ones are scraped again. Results carrying an 'error' (failed search
+# or product page) are journaled but never count as finished, so --resume
+# retries them; a run that completes without such rows removes its journal.
+# usage:
+#     journal = checkpoint.open_journal(site, sheet_path, resume=True)
+#     for idx, result in checkpoint.scrape_resumable(site, scrape_rows, rows, keys, journal):
+#         ...
+#     checkpoint.close_journal(journal, finished=True)
+
+JOURNAL_PATH = os.path.join(http_client.CACHE_DIR, 'journal')
+
+log = logs.get_logger(__name__)
+
+
+def _journal_path(site, sheet_path):
+    digest = hashlib.sha1(os.path.abspath(sheet_path).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(JOURNAL_PATH, f"{site}-{digest}.jsonl")
+
+
+def open_journal(site, sheet_path, resume=False):
+    path = _journal_path(site, sheet_path)
+    done = {}
+    if resume:
+        try:
+            with open(path, encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last line from an interrupted write
+                        continue
+                    done[entry['idx']] = (entry['key'], entry['result'])
+        except OSError:
+            pass
+    os.makedirs(JOURNAL_PATH, exist_ok=True)
+    fh = open(path, 'a' if resume else 'w', encoding='utf-8')
+    return {'path': path, 'fh': fh, 'done': done, 'failed': 0}
+
+
+def completed(journal, keys):
+    # {row index: result} for journaled rows whose inputs are unchanged and
+    # that did not fail
+    return {idx: result for idx, (key, result) in journal['done'].items()
+            if idx in keys.index and keys[idx] == key and not result.get('error')}
+
+
+def record(journal, idx, key, result):
+    if result.get('error'):
+        journal['failed'] += 1
+    journal['fh'].write(json.dumps({'idx': int(idx), 'key': key, 'result': result}, ensure_ascii=False) + '\n')
+    journal['fh'].flush()
+
+
+def close_journal(journal, finished):
+    journal['fh'].close()
+    if finished and journal['failed']:
+        log.info("%d rows failed; rerun with --resume to retry only those", journal['failed'])
+    elif finished:
+        os.remove(journal['path'])
+
+
+def scrape_resumable(site, scrape_rows, rows, keys, journal):
+    # Journaled results first, then scrape_rows over the rows still missing,
+    # journaling each result as it arrives
+    done = completed(journal, keys)
+    pending = [idx for idx in rows.index if idx not in done]
+    if done:
+        log.info("%s: resuming with %d rows done, %d left", site, len(done), len(pending))
+    yield from done.items()
+    if pending:
+        for idx, result in scrape_rows(rows.loc[pending]):
+            record(journal, idx, keys[idx], result)
+            yield idx, result
@@ -0,0 +1,113 @@
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
+from selenium.webdriver.firefox.options import Options
+
+import http_client
+import logs
+
+# Bounded pool of long-lived headless Firefox drivers shared by every scraper
+# that needs a browser. Drivers are reused across categories and products,
+# health-checked before reuse and recycled after MAX_PAGES_PER_DRIVER pages.
+# usage:
+#     with driver_pool.driver() as driver:
+#         driver.get(url)
+
+POOL_SIZE = int(os.environ.get('SCRAPER_DRIVER_POOL_SIZE', '2'))
+MAX_PAGES_PER_DRIVER = int(os.environ.get('SCRAPER_DRIVER_MAX_PAGES', '50'))
+PAGE_LOAD_TIMEOUT = 60
+
+log = logs.get_logger(__name__)
+_idle = queue.LifoQueue()
+_uses = {}
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(POOL_SIZE)
+
+
+def configure(pool_size=None, max_pages=None):
+    # Call before the first driver() call; resizing a busy pool is not supported
+    global POOL_SIZE, MAX_PAGES_PER_DRIVER, _slots
+    if pool_size is not None:
+        POOL_SIZE = max(1, pool_size)
+        _slots = threading.BoundedSemaphore(POOL_SIZE)
+    if max_pages is not None:
+        MAX_PAGES_PER_DRIVER = max(1, max_pages)
+
+
+def _new_driver():
+    options = Options()
+    options.add_argument('--headless')
+    profile = FirefoxProfile()
+    profile.set_preference("general.useragent.override", http_client.USER_AGENT)
+    options.profile = profile
+    new = webdriver.Firefox(options=options)
+    new.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    with _lock:
+        _uses[new] = 0
+    return new
+
+
+def _healthy(existing):
+    try:
+        existing.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _discard(existing):
+    with _lock:
+        _uses.pop(existing, None)
+    try:
+        existing.quit()
+    except Exception:
+        pass
+
+
+def _checkout():
+    while True:
+        try:
+            existing = _idle.get_nowait()
+        except queue.Empty:
+            return _new_driver()
+        if _healthy(existing):
+            return existing
+        log.warning("Discarding unresponsive browser driver")
+        _discard(existing)
+
+
+@contextmanager
+def driver():
+    slots = _slots
+    slots.acquire()
+    try:
+        current = _checkout()
+        try:
+            yield current
+        finally:
+            with _lock:
+                _uses[current] = _uses.get(current, 0) + 1
+                worn_out = _uses[current] >= MAX_PAGES_PER_DRIVER
+            if worn_out or not _healthy(current):
+                _discard(current)
+            else:
+                _idle.put(current)
+    finally:
+        slots.release()
+
+
+def shutdown():
+    while True:
+        try:
+            existing = _idle.get_nowait()
+        except queue.Empty:
+            break
+        _discard(existing)
+
+
+atexit.register(shutdown)
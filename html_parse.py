@@ -0,0 +1,108 @@
+import os
+import re
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+import metrics
+
+# HTML parsing front end shared by the scrapers.
+# Listing and search pages are mostly theme chrome (menus, footers, scripts)
+# around a handful of product cards, so a site can declare the regions it
+# reads as simple selectors ('div.product-grid-item', 'a.next',
+# 'a[aria-label=Next]') and only those subtrees are built. The backend is lxml
+# when it is installed (much faster tokenizer, in requrements.txt) and
+# html.parser otherwise; SCRAPER_HTML_PARSER forces one and set_site_parser()
+# overrides it per host (a shop's 'parser' spec key, see site_engine).
+# A parser that is not installed falls back to html.parser.
+# usage:
+#     soup = html_parse.parse(resp.text, ['div.productItem', 'a.next'], url=url)
+#     soup = html_parse.parse(resp.text)          # whole document
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+PARSER = os.environ.get('SCRAPER_HTML_PARSER', DEFAULT_PARSER)
+SITE_PARSERS = {}
+
+# Containers the paginated crawler reads the last page number from
+# (paginated_crawler.PAGINATION_SELECTOR); list pages should keep them
+PAGINATION_REGIONS = ['.pagination', '.woocommerce-pagination', '.page-numbers', 'a.next']
+
+_REGION_RE = re.compile(r'^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)(?:\[([\w-]+)=["\']?([^"\'\]]+)["\']?\])?$')
+
+
+def _compile_region(selector):
+    m = _REGION_RE.match(selector.strip())
+    if not m or not any(m.groups()):
+        raise ValueError(f"unsupported region selector: {selector!r}")
+    name, classes, attr, value = m.groups()
+    return name, frozenset(c for c in classes.split('.') if c), attr, value
+
+
+class RegionStrainer(SoupStrainer):
+    # Keeps a tag (with everything inside it) when it matches any region
+
+    def __init__(self, selectors):
+        super().__init__()
+        self.regions = [_compile_region(selector) for selector in selectors]
+
+    @property
+    def excludes_everything(self):
+        return not self.regions
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        attrs = attrs or {}
+        tag_classes = attrs.get('class') or ''
+        if not isinstance(tag_classes, str):
+            tag_classes = ' '.join(tag_classes)
+        tag_classes = set(tag_classes.split())
+        for region_name, classes, attr, value in self.regions:
+            if region_name and region_name != name:
+                continue
+            if not classes <= tag_classes:
+                continue
+            if attr and attrs.get(attr) != value:
+                continue
+            return True
+        return False
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def set_site_parser(host, parser):
+    SITE_PARSERS[host.lower().removeprefix('www.')] = parser
+
+
+def parser_for(url):
+    if url is None:
+        return PARSER
+    return SITE_PARSERS.get(urlsplit(url).netloc.lower().removeprefix('www.'), PARSER)
+
+
+def strainer(selectors):
+    # None or a RegionStrainer; raises ValueError for selectors beyond
+    # tag.class[attr=value]
+    return RegionStrainer(selectors) if selectors else None
+
+
+def parse(html, regions=None, url=None):
+    only = strainer(regions)
+    with metrics.span('parse', site=metrics.site_of(url)):
+        try:
+            return BeautifulSoup(html, parser_for(url), parse_only=only)
+        except FeatureNotFound:
+            return BeautifulSoup(html, 'html.parser', parse_only=only)
+
+
+def has_match(html, selector, url=None):
+    # Does the document contain selector? Builds only that region when the
+    # selector is simple enough to strain on
+    try:
+        soup = parse(html, [selector], url=url)
+    except ValueError:
+        soup = parse(html, url=url)
+    return soup.select_one(selector) is not None
@@ -0,0 +1,244 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+import logs
+import metrics
+import rate_limit
+
+# Shared HTTP client for all scrapers: one keep-alive session per host, one
+# User-Agent, compressed responses and retry-with-backoff on flaky answers.
+# Every request goes through the per-host rate limiter (rate_limit.py), which
+# also decides how long to back off after a 429/5xx before the retry.
+# Successful GETs are also kept in an on-disk response cache (see below).
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    # urllib3 only advertises 'br' when a brotli decoder is installed
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Accept-Language": "fa-IR,fa;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+POOL_MAXSIZE = 10
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+
+# Scratch space for anything the scrapers remember between runs
+CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR', '.scraper_cache')
+
+# Response cache: bodies are stored with their ETag/Last-Modified and
+# revalidated with If-None-Match/If-Modified-Since once older than the TTL
+# (seconds): the request's ttl=, else the host's, else SCRAPER_HTTP_CACHE_TTL.
+# TTL_OVERRIDE (run_all.py --cache-ttl) replaces all of them. SCRAPER_OFFLINE=1
+# serves everything from the cache and fails on misses instead of touching the
+# network.
+HTTP_CACHE_ENABLED = os.environ.get('SCRAPER_HTTP_CACHE', '1') != '0'
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, 'http')
+HTTP_CACHE_TTL = int(os.environ.get('SCRAPER_HTTP_CACHE_TTL', '0'))
+SITE_CACHE_TTLS = {}
+TTL_OVERRIDE = None
+OFFLINE = os.environ.get('SCRAPER_OFFLINE', '0') == '1'
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+# Test stand-in: with SCRAPER_BASE_URL=http://127.0.0.1:8765 every request for
+# https://<host>/<path> is sent to http://127.0.0.1:8765/<host>/<path> instead
+# (see benchmarks/mock_shop.py). Sessions, rate limits and cache entries stay
+# keyed on the real URL.
+BASE_URL = os.environ.get('SCRAPER_BASE_URL') or None
+
+log = logs.get_logger(__name__)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _make_session():
+    # urllib3 only retries connection failures; status retries happen in
+    # _send so that they pass through the rate limiter
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(url):
+    host = urlsplit(url).netloc.lower()
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _make_session()
+    return session
+
+
+def route(url):
+    # Where a request for url is actually sent
+    if not BASE_URL:
+        return url
+    parts = urlsplit(url)
+    target = f"{BASE_URL.rstrip('/')}/{parts.netloc.lower()}{parts.path or '/'}"
+    return f"{target}?{parts.query}" if parts.query else target
+
+
+def set_site_cache_ttl(host, seconds):
+    SITE_CACHE_TTLS[host.lower().removeprefix('www.')] = seconds
+
+
+def _cache_ttl(url, ttl=None):
+    if TTL_OVERRIDE is not None:
+        return TTL_OVERRIDE
+    if ttl is not None:
+        return ttl
+    host = urlsplit(url).netloc.lower().removeprefix('www.')
+    return SITE_CACHE_TTLS.get(host, HTTP_CACHE_TTL)
+
+
+def _cache_paths(url):
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    base = os.path.join(HTTP_CACHE_PATH, digest[:2], digest)
+    return base + '.json', base + '.body'
+
+
+def _cache_load(url):
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, encoding='utf-8') as fh:
+            meta = json.load(fh)
+        if meta.get('url') != url:
+            return None
+        with open(body_path, 'rb') as fh:
+            meta['body'] = fh.read()
+    except (OSError, ValueError):
+        return None
+    return meta
+
+
+def _write_atomic(path, data, mode):
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _cache_store(url, resp):
+    meta_path, body_path = _cache_paths(url)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {
+        'url': url,
+        'stored_at': time.time(),
+        'encoding': resp.encoding,
+        'headers': {name: resp.headers[name] for name in CACHED_HEADERS if name in resp.headers},
+    }
+    _write_atomic(body_path, resp.content, 'wb')
+    _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False), 'w')
+
+
+def _cache_touch(url, entry, resp):
+    # 304: keep the body, refresh the timestamp and any new validators
+    meta_path, _ = _cache_paths(url)
+    entry = dict(entry, stored_at=time.time())
+    for name in CACHED_HEADERS:
+        if name in resp.headers:
+            entry['headers'][name] = resp.headers[name]
+    body = entry.pop('body')
+    _write_atomic(meta_path, json.dumps(entry, ensure_ascii=False), 'w')
+    entry['body'] = body
+    return entry
+
+
+def _cached_response(url, entry, source):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = 'OK'
+    resp.url = url
+    resp._content = entry['body']
+    resp.encoding = entry.get('encoding')
+    resp.headers = CaseInsensitiveDict(entry.get('headers', {}))
+    resp.headers['X-Scraper-Cache'] = source
+    return resp
+
+
+def _conditional_headers(entry):
+    conditional = {}
+    if entry is None:
+        return conditional
+    if 'ETag' in entry['headers']:
+        conditional['If-None-Match'] = entry['headers']['ETag']
+    if 'Last-Modified' in entry['headers']:
+        conditional['If-Modified-Since'] = entry['headers']['Last-Modified']
+    return conditional
+
+
+def _send(session, url, headers, timeout):
+    site = metrics.site_of(url)
+    for attempt in range(RETRY_TOTAL + 1):
+        rate_limit.acquire(url)
+        if attempt:
+            metrics.count('retries', site=site)
+        with metrics.span('fetch', site=site):
+            resp = session.get(route(url), headers=headers, timeout=timeout)
+        metrics.count('requests', site=site, status=resp.status_code)
+        metrics.count('response_bytes', len(resp.content), site=site)
+        throttled = rate_limit.report(url, resp.status_code, resp.headers.get('Retry-After'))
+        if not throttled or attempt == RETRY_TOTAL:
+            return resp
+        resp.close()
+
+
+def get(url, params=None, headers=None, timeout=20, cache=True, ttl=None):
+    # ttl: seconds a cached copy of this URL is reused without revalidating
+    if params:
+        url = requests.Request('GET', url, params=params).prepare().url
+    session = get_session(url)
+    if not (cache and HTTP_CACHE_ENABLED):
+        return _send(session, url, headers, timeout)
+
+    entry = _cache_load(url)
+    if entry is not None and (OFFLINE or time.time() - entry['stored_at'] < _cache_ttl(url, ttl)):
+        metrics.count('http_cache', site=metrics.site_of(url), result='hit')
+        return _cached_response(url, entry, 'hit')
+    if OFFLINE:
+        raise requests.ConnectionError(f"offline mode and no cached response for {url}")
+
+    request_headers = dict(headers or {})
+    request_headers.update(_conditional_headers(entry))
+    resp = _send(session, url, request_headers, timeout)
+    if resp.status_code == 304 and entry is not None:
+        metrics.count('http_cache', site=metrics.site_of(url), result='revalidated')
+        return _cached_response(url, _cache_touch(url, entry, resp), 'revalidated')
+    metrics.count('http_cache', site=metrics.site_of(url), result='miss')
+    if resp.status_code == 200:
+        try:
+            _cache_store(url, resp)
+        except OSError as e:
+            log.warning("Could not cache %s: %s", url, e)
+    return resp
+
+
+def close_all():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+atexit.register(close_all)
@@ -0,0 +1,98 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+import metrics
+
+# Logging for the scrapers. Modules log through get_logger(__name__) with
+# %-style arguments, so a message below the configured level costs one level
+# check and is never formatted. Records are handed to a queue and written by a
+# background thread (console, plus one JSON object per line when a JSONL path
+# is set), so scraping threads never block on terminal or file I/O.
+# Levels, most to least verbose:
+#   TRACE - each row's match terms and winning score, full catalog dumps
+#   DEBUG - one line per row / page / request
+#   INFO  - a bounded per-site summary (the default)
+# SCRAPER_LOG_LEVEL and SCRAPER_LOG_JSONL set the defaults
+# (run_all.py --log-level / --log-jsonl).
+
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+LEVEL = os.environ.get('SCRAPER_LOG_LEVEL', 'INFO').upper()
+JSONL_PATH = os.environ.get('SCRAPER_LOG_JSONL') or None
+ROOT = 'scraper'
+CONSOLE_FORMAT = '[%(levelname)s] %(message)s'
+
+_listener = None
+
+
+class _SiteFilter(logging.Filter):
+    # Runs in the calling thread, where the site context (metrics.site_context) is set
+    def filter(self, record):
+        record.site = metrics.current_site()
+        return True
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'site': getattr(record, 'site', ''),
+            'message': record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def shutdown():
+    # Drains the queue; safe to call more than once
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure(level=None, jsonl_path=None):
+    global LEVEL, JSONL_PATH, _listener
+    LEVEL = (level or LEVEL).upper()
+    JSONL_PATH = jsonl_path or JSONL_PATH
+    shutdown()
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    handlers = [console]
+    if JSONL_PATH:
+        directory = os.path.dirname(JSONL_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        jsonl = logging.FileHandler(JSONL_PATH, encoding='utf-8')
+        jsonl.setFormatter(JsonLineFormatter())
+        handlers.append(jsonl)
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(_SiteFilter())
+    root = logging.getLogger(ROOT)
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LEVEL)
+    root.propagate = False
+    _listener = QueueListener(records, *handlers)
+    _listener.start()
+
+
+def get_logger(name):
+    if _listener is None:
+        configure()
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+atexit.register(shutdown)
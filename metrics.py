@@ -0,0 +1,156 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# Run metrics: timing spans per stage (fetch, render, parse, match, write, ...)
+# and counters (requests, bytes, retries, cache hits, ...), labelled by site.
+# Network and parse events are labelled with the host they touched; matching
+# and other in-process work with the site whose scrape_rows is running
+# (site_context, set by run_all). A run summary can be written as JSON and as
+# a Prometheus textfile (node_exporter textfile collector format).
+# usage:
+#     with metrics.span('parse', site=metrics.site_of(url)):
+#         ...
+#     metrics.count('requests', site=metrics.site_of(url))
+#     metrics.write_json('metrics.json'); metrics.write_prometheus('scraper.prom')
+# export() writes whichever of SCRAPER_METRICS_JSON / SCRAPER_METRICS_PROM is set
+# (run_all.py --metrics-json / --metrics-prom).
+
+PREFIX = 'scraper'
+JSON_PATH = os.environ.get('SCRAPER_METRICS_JSON') or None
+PROM_PATH = os.environ.get('SCRAPER_METRICS_PROM') or None
+
+_current_site = contextvars.ContextVar('metrics_site', default='')
+_lock = threading.Lock()
+# {(stage, site): [calls, total seconds, max seconds]}
+_spans = {}
+# {(name, ((label, value), ...)): value}
+_counters = {}
+
+
+def site_of(url):
+    return urlsplit(url).netloc.lower().removeprefix('www.') if url else ''
+
+
+@contextmanager
+def site_context(site):
+    token = _current_site.set(site)
+    try:
+        yield
+    finally:
+        _current_site.reset(token)
+
+
+def current_site():
+    return _current_site.get()
+
+
+@contextmanager
+def span(stage, site=None):
+    site = site or _current_site.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _spans.setdefault((stage, site), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+
+
+def count(name, value=1, site=None, **labels):
+    labels['site'] = site if site is not None else _current_site.get()
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def snapshot():
+    with _lock:
+        spans = [{'stage': stage, 'site': site, 'calls': calls, 'seconds': round(total, 6),
+                  'max_seconds': round(longest, 6)}
+                 for (stage, site), (calls, total, longest) in sorted(_spans.items())]
+        counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(_counters.items())]
+    return {'spans': spans, 'counters': counters}
+
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+def write_json(path, **extra):
+    report = dict(extra)
+    report.update(snapshot())
+    _write_atomic(path, json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+
+
+def _label_text(labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+
+def prometheus_text():
+    data = snapshot()
+    lines = [
+        f'# HELP {PREFIX}_stage_seconds_total Time spent per stage and site.',
+        f'# TYPE {PREFIX}_stage_seconds_total counter',
+    ]
+    for entry in data['spans']:
+        labels = _label_text([('stage', entry['stage']), ('site', entry['site'])])
+        lines.append(f"{PREFIX}_stage_seconds_total{labels} {entry['seconds']}")
+    lines += [f'# HELP {PREFIX}_stage_calls_total Spans recorded per stage and site.',
+              f'# TYPE {PREFIX}_stage_calls_total counter']
+    for entry in data['spans']:
+        labels = _label_text([('stage', entry['stage']), ('site', entry['site'])])
+        lines.append(f"{PREFIX}_stage_calls_total{labels} {entry['calls']}")
+    typed = set()
+    for entry in data['counters']:
+        metric = f"{PREFIX}_{entry['name']}_total"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f'# TYPE {metric} counter')
+        lines.append(f"{metric}{_label_text(sorted(entry['labels'].items()))} {entry['value']}")
+    lines.append(f'# TYPE {PREFIX}_last_run_timestamp_seconds gauge')
+    lines.append(f'{PREFIX}_last_run_timestamp_seconds {int(time.time())}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path):
+    _write_atomic(path, prometheus_text())
+
+
+def export(**extra):
+    if JSON_PATH:
+        write_json(JSON_PATH, **extra)
+    if PROM_PATH:
+        write_prometheus(PROM_PATH)
+
+
+def summary_lines():
+    # Seconds per stage summed over sites, longest first
+    totals = {}
+    for entry in snapshot()['spans']:
+        calls, seconds = totals.get(entry['stage'], (0, 0.0))
+        totals[entry['stage']] = (calls + entry['calls'], seconds + entry['seconds'])
+    return [f"{stage:<8} {seconds:8.2f}s in {calls} calls"
+            for stage, (calls, seconds) in sorted(totals.items(), key=lambda item: -item[1][1])]
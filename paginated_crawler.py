@@ -0,0 +1,197 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import re
+import time
+from urllib.parse import urlsplit
+
+import html_parse
+import http_client
+import logs
+
+# Concurrent crawler for paginated category listings. Page 1 is fetched first
+# to read the last page number from the pagination widget; the remaining pages
+# are then fetched concurrently (capped per host) and returned in page order.
+# When the widget does not expose the last page, pages are probed ahead
+# speculatively in batches until an empty page is reached. A page that fails
+# to fetch or parse fails the crawl: crawl_categories raises its error rather
+# than return a catalog missing that page's products.
+# Incremental mode: every crawl stores the category's pages under the cache
+# dir. The next crawl walks pages in batches and, once UNCHANGED_PAGES
+# consecutive pages match the stored ones (same products, URLs and prices),
+# stops and reuses the stored remainder. A full crawl still runs every
+# FULL_CRAWL_EVERY seconds to reconcile. A crawl that hit a failed page is not
+# stored, so it is never reused as the complete category.
+
+MAX_CONCURRENCY_PER_HOST = 4
+MAX_PAGES = 100
+
+INCREMENTAL = os.environ.get('SCRAPER_INCREMENTAL', '1') != '0'
+UNCHANGED_PAGES = int(os.environ.get('SCRAPER_UNCHANGED_PAGES', '2'))
+FULL_CRAWL_EVERY = int(os.environ.get('SCRAPER_FULL_CRAWL_EVERY', str(7 * 24 * 3600)))
+CATALOG_PATH = os.path.join(http_client.CACHE_DIR, 'catalogs')
+
+PAGE_NUMBER_RE = re.compile(r'(?:/page/|[?&]page=)(\d+)')
+PAGINATION_SELECTOR = 'a.page-numbers, .pagination a, .woocommerce-pagination a, nav a[href*="page"]'
+
+log = logs.get_logger(__name__)
+
+
+def path_page_url(category_url, page):
+    # WooCommerce style: /category/page/N/
+    return category_url if page == 1 else f"{category_url.rstrip('/')}/page/{page}/"
+
+
+def query_page_url(category_url, page):
+    # Query string style: /category?page=N
+    return category_url if page == 1 else f"{category_url}?page={page}"
+
+
+def last_page_number(soup):
+    numbers = []
+    for a in soup.select(PAGINATION_SELECTOR):
+        m = PAGE_NUMBER_RE.search(a.get('href', ''))
+        if m:
+            numbers.append(int(m.group(1)))
+    return max(numbers) if numbers else None
+
+
+def _catalog_path(category_url):
+    digest = hashlib.sha1(category_url.encode('utf-8')).hexdigest()
+    return os.path.join(CATALOG_PATH, f"{digest}.json")
+
+
+def load_catalog(category_url):
+    try:
+        with open(_catalog_path(category_url), encoding='utf-8') as fh:
+            stored = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return stored if stored.get('category_url') == category_url else None
+
+
+def save_catalog(category_url, pages, full_crawl_at):
+    path = _catalog_path(category_url)
+    os.makedirs(CATALOG_PATH, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump({'category_url': category_url, 'full_crawl_at': full_crawl_at, 'pages': pages},
+                  fh, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def fetch_soup(url, regions=None):
+    resp = http_client.get(url, timeout=20)
+    resp.raise_for_status()
+    return html_parse.parse(resp.text, regions, url=url)
+
+
+def _fetch_and_parse(url, parse_page, has_next, fetch):
+    log.debug("Scraping: %s", url)
+    try:
+        soup = fetch(url)
+        products = parse_page(soup)
+    except Exception as e:
+        log.warning("Error scraping %s: %s", url, e)
+        return None, False, None, e
+    more = bool(products) and (has_next(soup, products) if has_next else True)
+    return products, more, soup, None
+
+
+async def _crawl_one(category_url, page_url, parse_page, has_next, fetch, semaphore, batch, max_pages,
+                     incremental):
+    async def load(page):
+        async with semaphore:
+            return await asyncio.to_thread(
+                _fetch_and_parse, page_url(category_url, page), parse_page, has_next, fetch)
+
+    stored = load_catalog(category_url) if incremental else None
+    full = stored is None or time.time() - stored.get('full_crawl_at', 0) >= FULL_CRAWL_EVERY
+    stored_pages = [] if full else stored['pages']
+    started = time.time()
+
+    products, more, soup, error = await load(1)
+    if not products:
+        return [], error
+    pages = [products]
+    unchanged = int(stored_pages[:1] == [products])
+    reused = 0
+    if more:
+        last = last_page_number(soup)
+        stop = max_pages if last is None else min(last, max_pages)
+        # A full crawl with a known last page fetches everything at once;
+        # otherwise pages are probed a batch at a time, and an incremental
+        # crawl compares only as many pages ahead as it needs to settle
+        if full:
+            step = stop - 1 if last is not None else batch
+        else:
+            step = max(1, min(batch, UNCHANGED_PAGES))
+        settled = not full and unchanged >= UNCHANGED_PAGES
+        page = 2
+        while more and page <= stop and not settled:
+            batch_stop = min(page + step, stop + 1)
+            results = await asyncio.gather(*(load(p) for p in range(page, batch_stop)))
+            for page_products, page_more, _, error in results:
+                if error is not None or not page_products:
+                    more = False
+                    break
+                stored_page = stored_pages[len(pages)] if len(pages) < len(stored_pages) else None
+                unchanged = unchanged + 1 if page_products == stored_page else 0
+                pages.append(page_products)
+                settled = not full and unchanged >= UNCHANGED_PAGES
+                if not page_more or settled:
+                    more = page_more
+                    break
+            page = batch_stop
+        if more and settled:
+            tail = stored_pages[len(pages):stop]
+            reused = len(tail)
+            pages.extend(tail)
+
+    if reused:
+        log.info("%s: %d unchanged pages, reused %d stored pages after page %d",
+                 category_url, UNCHANGED_PAGES, reused, len(pages) - reused)
+    if error is not None:
+        # Pages after the failed one are missing; keep the stored copy as it is
+        log.warning("%s: crawl stopped at page %d, stored pages left unchanged", category_url, len(pages) + 1)
+    elif incremental:
+        save_catalog(category_url, pages, started if full else stored['full_crawl_at'])
+    return [prod for page_products in pages for prod in page_products], error
+
+
+async def _crawl_all(category_urls, page_url, parse_page, has_next, fetch, concurrency, max_pages,
+                     incremental):
+    semaphores = {}
+    for url in category_urls:
+        host = urlsplit(url).netloc.lower()
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(
+        _crawl_one(url, page_url, parse_page, has_next, fetch,
+                   semaphores[urlsplit(url).netloc.lower()], max(1, concurrency), max_pages, incremental)
+        for url in category_urls
+    ))
+    errors = [error for _, error in results if error is not None]
+    return [prod for category_products, _ in results for prod in category_products], errors
+
+
+def crawl_categories(category_urls, parse_page, page_url=path_page_url, has_next=None,
+                     fetch=fetch_soup, concurrency=MAX_CONCURRENCY_PER_HOST, max_pages=MAX_PAGES,
+                     regions=None, incremental=None):
+    # parse_page(soup) -> list of product dicts (empty means past the last page)
+    # has_next(soup, products) -> False to stop after this page
+    # regions: selectors parse_page and has_next read (see html_parse); the
+    # pagination containers are kept as well. fetch must accept regions=
+    # incremental: stop early on unchanged pages (defaults to INCREMENTAL)
+    # Raises the first page error once every category has been crawled
+    if regions is not None:
+        fetch = functools.partial(fetch, regions=list(regions) + html_parse.PAGINATION_REGIONS)
+    incremental = INCREMENTAL if incremental is None else incremental
+    products, errors = asyncio.run(_crawl_all(list(category_urls), page_url, parse_page, has_next,
+                                              fetch, concurrency, max_pages, incremental))
+    if errors:
+        raise errors[0]
+    return products
+
@@ -0,0 +1,121 @@
+import argparse
+import os
+import sqlite3
+import time
+import uuid
+
+import prices
+
+# Append-only price history. Every scrape observation (sheet row, site, matched
+# title/URL, raw and parsed price, time) is stored in a local SQLite file, and
+# the workbook's site columns are filled from the latest observation per row
+# and site, so a run only adds to the history instead of overwriting it.
+# usage:
+#     python price_history.py trend "surface pro 11" --days 90
+#     python price_history.py latest --sites micropple.ir
+
+DB_PATH = os.environ.get('SCRAPER_HISTORY_DB', 'price_history.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    observed_at INTEGER NOT NULL,
+    row_key TEXT NOT NULL,
+    product TEXT NOT NULL,
+    site TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    price_text TEXT,
+    price_min INTEGER,
+    price_max INTEGER
+);
+CREATE INDEX IF NOT EXISTS observations_row_site ON observations (row_key, site, observed_at);
+CREATE INDEX IF NOT EXISTS observations_product ON observations (product, observed_at);
+CREATE INDEX IF NOT EXISTS observations_site ON observations (site, observed_at);
+"""
+
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def new_run_id():
+    return uuid.uuid4().hex
+
+
+def record(conn, run_id, site, keys, products, results, observed_at=None):
+    # keys / products: {row index: row key / product name}; results: [(idx, result)]
+    observed_at = int(observed_at or time.time())
+    batch = []
+    for idx, result in results:
+        if result.get('error'):
+            # A failed lookup is not an observation; the row keeps its last one
+            continue
+        price = result.get('price', '') or ''
+        low, high = prices.parse_price(price)
+        batch.append((run_id, observed_at, keys[idx], str(products[idx]).strip().lower(), site,
+                      result.get('title', '') or '', result.get('url', '') or '', price, low, high))
+    with conn:
+        conn.executemany(
+            "INSERT INTO observations (run_id, observed_at, row_key, product, site, title, url,"
+            " price_text, price_min, price_max) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+    return len(batch)
+
+
+def latest(conn, sites=None):
+    # Newest observation per (row key, site): [(row_key, site, title, url, price_text)]
+    query = """
+        SELECT o.row_key, o.site, o.title, o.url, o.price_text
+        FROM observations o
+        JOIN (SELECT row_key, site, MAX(id) AS id FROM observations GROUP BY row_key, site) newest
+          ON o.id = newest.id
+    """
+    params = ()
+    if sites:
+        query += f" WHERE o.site IN ({', '.join('?' * len(sites))})"
+        params = tuple(sites)
+    return conn.execute(query, params).fetchall()
+
+
+def trend(conn, product, days=90, sites=None):
+    # Daily lowest price per site for one product: [(day, site, min Toman, max Toman)]
+    query = """
+        SELECT date(observed_at, 'unixepoch') AS day, site, MIN(price_min), MAX(price_max)
+        FROM observations
+        WHERE product = ? AND observed_at >= ? AND price_min IS NOT NULL
+    """
+    params = [product.strip().lower(), int(time.time() - days * 86400)]
+    if sites:
+        query += f" AND site IN ({', '.join('?' * len(sites))})"
+        params.extend(sites)
+    query += " GROUP BY day, site ORDER BY day, site"
+    return conn.execute(query, params).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the local price history.')
+    parser.add_argument('--db', default=DB_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    trend_cmd = commands.add_parser('trend', help='daily lowest price per site for a product')
+    trend_cmd.add_argument('product')
+    trend_cmd.add_argument('--days', type=int, default=90)
+    trend_cmd.add_argument('--sites', nargs='+')
+    latest_cmd = commands.add_parser('latest', help='newest observation per row and site')
+    latest_cmd.add_argument('--sites', nargs='+')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    if args.command == 'trend':
+        for day, site, low, high in trend(conn, args.product, args.days, args.sites):
+            print(f"{day}  {site:<16} {low:>14,}" + (f" - {high:,}" if high != low else ''))
+    else:
+        for row_key, site, title, url, price_text in latest(conn, args.sites):
+            print(f"{row_key}  {site:<16} {price_text or '-'}  {url}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
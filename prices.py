@@ -0,0 +1,75 @@
+import re
+
+import pandas as pd
+
+from specs import to_english_digits
+
+# Scraped price text -> integer Toman.
+# Handles Persian/Arabic digits, ',' '٬' '.' thousands separators, the Rial and
+# Toman currency words, 'هزار'/'میلیون' multipliers and any text holding more
+# than one price: ' - '-joined ranges from get_price_mysurface or a struck-out
+# regular price next to the sale price. Such text gives (lowest, highest).
+# usage:
+#     parse_price('۴۵,۰۰۰,۰۰۰ تومان')          -> (45000000, 45000000)
+#     parse_price('1,282,290,000 ريال')         -> (128229000, 128229000)
+#     parse_price('45.5 میلیون تومان')          -> (45500000, 45500000)
+#     parse_price('')                            -> (None, None)
+
+# Anything smaller is a percentage, a count or a model number, not a price
+MIN_PRICE = 1000
+
+_MULTIPLIER_WORDS = r'\s*(?:میلیون|هزار)'
+# A decimal ('45.5', '45٫5', '45/5') only counts in front of a multiplier;
+# elsewhere '.' is a thousands separator
+_NUMBER_RE = re.compile(r'(?P<decimal>\d+[.٫/]\d+)(?=' + _MULTIPLIER_WORDS + r')|\d{1,3}(?:[,٬.]\d{3})+|\d+')
+_RIAL_RE = re.compile(r'ریال|ريال|rial', re.IGNORECASE)
+_MULTIPLIERS = [
+    (re.compile(r'\s*میلیون'), 1_000_000),
+    (re.compile(r'\s*هزار'), 1_000),
+]
+
+
+def _amounts(text):
+    for m in _NUMBER_RE.finditer(text):
+        if m.group('decimal'):
+            value = float(re.sub(r'[٫/]', '.', m.group('decimal')))
+        else:
+            value = int(re.sub(r'\D', '', m.group(0)))
+        for pattern, factor in _MULTIPLIERS:
+            if pattern.match(text, m.end()):
+                value *= factor
+                break
+        value = int(round(value))
+        if value >= MIN_PRICE:
+            yield value
+
+
+def parse_price(text):
+    # Returns (min Toman, max Toman), or (None, None) when text holds no price
+    if text is None or text != text:
+        return None, None
+    text = to_english_digits(text)
+    amounts = list(_amounts(text))
+    if not amounts:
+        return None, None
+    if _RIAL_RE.search(text):
+        amounts = [value // 10 for value in amounts]
+    return min(amounts), max(amounts)
+
+
+def column_names(site):
+    # 'micropple.ir' -> ('micropplepricemin', 'micropplepricemax'), next to
+    # the 'microppleproducturl' naming the URL columns use
+    prefix = site.split('.')[0]
+    return f'{prefix}pricemin', f'{prefix}pricemax'
+
+
+def parse_column(raw):
+    # Raw price column -> DataFrame of nullable Int64 'min'/'max' columns,
+    # each distinct text parsed once
+    parsed = {text: parse_price(text) for text in pd.unique(raw.dropna())}
+    pairs = raw.map(lambda text: parsed.get(text, (None, None)))
+    return pd.DataFrame({
+        'min': pd.array([pair[0] for pair in pairs], dtype='Int64'),
+        'max': pd.array([pair[1] for pair in pairs], dtype='Int64'),
+    }, index=raw.index)
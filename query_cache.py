@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import metrics
+
+# Result cache for per-row site searches, keyed by (namespace, normalized query).
+# Identical queries are collapsed: the first caller runs the search and any
+# concurrent caller with the same key waits for that result instead of sending
+# its own request. Results live in memory for the run and, when a TTL is set
+# (SCRAPER_QUERY_CACHE_TTL seconds), in a small JSON store on disk.
+# Searches that raise are not cached.
+
+DISK_TTL = int(os.environ.get('SCRAPER_QUERY_CACHE_TTL', '0'))
+CACHE_PATH = os.path.join(http_client.CACHE_DIR, 'queries')
+PREFETCH_WORKERS = 4
+
+_memory = {}
+_inflight = {}
+_lock = threading.Lock()
+
+
+def normalize_query(query):
+    return ' '.join(str(query).lower().split())
+
+
+def _disk_path(namespace, key):
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_PATH, namespace, f"{digest}.json")
+
+
+def _disk_get(namespace, key, ttl):
+    if not ttl:
+        return None
+    try:
+        with open(_disk_path(namespace, key), encoding='utf-8') as fh:
+            entry = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if entry.get('query') != key or time.time() - entry.get('stored_at', 0) > ttl:
+        return None
+    return entry
+
+
+def _disk_put(namespace, key, value, ttl):
+    if not ttl:
+        return
+    path = _disk_path(namespace, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump({'query': key, 'stored_at': time.time(), 'value': value}, fh, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def cached(namespace, query, search, ttl=None):
+    # search(query) must return JSON-serializable data and raise on failure
+    ttl = DISK_TTL if ttl is None else ttl
+    key = normalize_query(query)
+    memory_key = (namespace, key)
+    with _lock:
+        if memory_key in _memory:
+            metrics.count('query_cache', namespace=namespace, result='memory')
+            return _memory[memory_key]
+        waiter = _inflight.get(memory_key)
+        if waiter is None:
+            _inflight[memory_key] = threading.Event()
+    if waiter is not None:
+        waiter.wait()
+        with _lock:
+            if memory_key in _memory:
+                return _memory[memory_key]
+        # The first caller failed; run the search ourselves
+        return cached(namespace, query, search, ttl=ttl)
+
+    try:
+        entry = _disk_get(namespace, key, ttl)
+        if entry is not None:
+            metrics.count('query_cache', namespace=namespace, result='disk')
+            value = entry['value']
+        else:
+            metrics.count('query_cache', namespace=namespace, result='miss')
+            value = search(query)
+            _disk_put(namespace, key, value, ttl)
+        with _lock:
+            _memory[memory_key] = value
+        return value
+    finally:
+        with _lock:
+            _inflight.pop(memory_key).set()
+
+
+def prefetch(namespace, queries, search, ttl=None, workers=PREFETCH_WORKERS):
+    # Warm the cache for every distinct query concurrently.
+    # -> (distinct queries, {normalized query: exception} of the failed ones),
+    # so callers can report a failure for every row sharing the query instead
+    # of searching again
+    distinct = {normalize_query(q): q for q in queries}
+    failed = {}
+
+    def warm(item):
+        key, query = item
+        try:
+            cached(namespace, query, search, ttl=ttl)
+        except Exception as e:
+            failed[key] = e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(warm, distinct.items()))
+    return len(distinct), failed
+
+
+def clear_memory():
+    with _lock:
+        _memory.clear()
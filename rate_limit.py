@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import logs
+
+# Per-host token bucket in front of every request the scrapers send.
+# Each host refills at its own rate (requests/second) up to BURST tokens, so
+# hosts never wait on each other and in-memory work is never throttled. The
+# rate adapts: a 429/5xx answer halves it and pauses the host for Retry-After
+# (or an exponential backoff when the server gives none), and every success
+# creeps it back up towards the configured rate.
+# usage:
+#     rate_limit.acquire(url)          # blocks until the host has a token
+#     resp = session.get(url)
+#     rate_limit.report(url, resp.status_code, resp.headers.get('Retry-After'))
+
+RATE_PER_HOST = float(os.environ.get('SCRAPER_RATE_PER_HOST', '2'))
+BURST = 2
+MIN_RATE = 0.1
+RECOVERY_STEP = 0.1
+BACKOFF = 0.5
+MAX_PAUSE = 120
+THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+
+log = logs.get_logger(__name__)
+_hosts = {}
+_lock = threading.Lock()
+
+
+def configure(rate_per_host=None):
+    global RATE_PER_HOST
+    if rate_per_host is not None:
+        RATE_PER_HOST = rate_per_host
+        with _lock:
+            _hosts.clear()
+
+
+def _state(host, now):
+    state = _hosts.get(host)
+    if state is None:
+        state = _hosts[host] = {'rate': RATE_PER_HOST, 'tokens': BURST, 'updated': now,
+                                'paused_until': 0.0, 'strikes': 0}
+    return state
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower()
+
+
+def retry_after_seconds(value):
+    # Retry-After is either delta-seconds or an HTTP date; None if unusable
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def acquire(url):
+    host = _host(url)
+    while True:
+        with _lock:
+            now = time.monotonic()
+            state = _state(host, now)
+            state['tokens'] = min(BURST, state['tokens'] + (now - state['updated']) * state['rate'])
+            state['updated'] = now
+            if now < state['paused_until']:
+                wait = state['paused_until'] - now
+            elif state['tokens'] >= 1:
+                state['tokens'] -= 1
+                return
+            else:
+                wait = (1 - state['tokens']) / state['rate']
+        time.sleep(wait)
+
+
+def report(url, status, retry_after=None):
+    # Feed a response status back; returns True when the request is worth retrying
+    host = _host(url)
+    with _lock:
+        now = time.monotonic()
+        state = _state(host, now)
+        if status not in THROTTLE_STATUSES:
+            state['strikes'] = 0
+            state['rate'] = min(RATE_PER_HOST, state['rate'] + RECOVERY_STEP)
+            return False
+        pause = retry_after_seconds(retry_after)
+        if pause is None:
+            pause = BACKOFF * 2 ** state['strikes']
+        state['strikes'] += 1
+        state['rate'] = max(MIN_RATE, state['rate'] / 2)
+        state['tokens'] = 0
+        pause = min(pause, MAX_PAUSE)
+        state['paused_until'] = max(state['paused_until'], now + pause)
+        rate = state['rate']
+    log.warning("%s answered %s, slowing to %.2f req/s and pausing %.1fs", host, status, rate, pause)
+    return True
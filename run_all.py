@@ -0,0 +1,140 @@
+import argparse
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import checkpoint
+import driver_pool
+import http_client
+import logs
+import metrics
+import paginated_crawler
+import price_history
+import rate_limit
+import sheet
+import site_engine
+import sites
+import store_api
+import workbook
+
+# Runs every shop in sites.SPECS concurrently against a single in-memory copy of the
+# workbook, appends the results to the price history and writes
+# SampleSites.xlsx once at the end from the history's latest snapshot.
+# usage: python run_all.py [--sites micropple.ir parsanme.com] [--sheet SampleSites.xlsx]
+#        python run_all.py --sheet SampleSites.parquet --export-xlsx SampleSites.xlsx
+
+log = logs.get_logger(__name__)
+
+
+def scrape_site(spec, rows, keys, journal):
+    start = time.time()
+    scrape_rows = functools.partial(site_engine.scrape_rows, spec)
+    with metrics.site_context(spec['site']), metrics.span('scrape'):
+        results = list(checkpoint.scrape_resumable(spec['site'], scrape_rows, rows, keys, journal))
+    return results, time.time() - start
+
+
+def run(site_names, path=sheet.SHEET_PATH, workers=None, history_db=price_history.DB_PATH, resume=False,
+        export_xlsx=None):
+    specs = [sites.SPECS[site] for site in site_names]
+    site_columns = {spec['site']: spec['url_column'] for spec in specs}
+    df = sheet.load_sheet(path, site_columns)
+    for spec in specs:
+        sheet.ensure_site_columns(df, spec['site'], spec['url_column'])
+    rows = sheet.input_rows(df)
+    keys = sheet.row_keys(df)
+    journals = {spec['site']: checkpoint.open_journal(spec['site'], path, resume=resume) for spec in specs}
+
+    conn = price_history.connect(history_db)
+    run_id = price_history.new_run_id()
+    start = time.time()
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers or len(specs)) as executor:
+        futures = {executor.submit(scrape_site, spec, rows, keys, journals[spec['site']]): spec['site']
+                   for spec in specs}
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                results, elapsed = future.result()
+            except Exception as e:
+                log.error("%s failed: %s", site, e)
+                failed.append(site)
+                checkpoint.close_journal(journals[site], finished=False)
+                continue
+            checkpoint.close_journal(journals[site], finished=True)
+            sheet.record_results(conn, run_id, df, site, results)
+            log.info("%s: %d rows, %d priced, in %.1fs", site, len(results),
+                     sum(1 for _, result in results if result.get('price')), elapsed)
+
+    sheet.apply_latest(df, conn, site_columns)
+    conn.close()
+    sheet.save_sheet(df, path, site_columns)
+    if export_xlsx:
+        with metrics.span('write'):
+            log.info("%s: %d cells changed", export_xlsx, workbook.convert(path, export_xlsx))
+    elapsed = time.time() - start
+    log.info("Done in %.1fs. Prices and product URLs updated in %s.", elapsed, path)
+    for line in metrics.summary_lines():
+        log.info("%s", line)
+    metrics.export(run_id=run_id, sites=site_names, failed=failed, seconds=round(elapsed, 3))
+    if failed:
+        log.warning("Sites left unchanged after errors: %s. "
+                    "Finished rows are kept; rerun with --resume to scrape only the rest.", ', '.join(failed))
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Refresh all site prices in one pass.')
+    parser.add_argument('--sites', nargs='+', choices=sorted(sites.SPECS), default=list(sites.SPECS))
+    parser.add_argument('--sheet', default=sheet.SHEET_PATH)
+    parser.add_argument('--export-xlsx', default=None,
+                        help='after the run, update this Excel file from the sheet (changed cells only)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--browser-pool-size', type=int, default=None,
+                        help='headless browsers shared by the Selenium fallbacks')
+    parser.add_argument('--offline', action='store_true',
+                        help='serve every page from the response cache, never touch the network')
+    parser.add_argument('--cache-ttl', type=int, default=None,
+                        help='seconds a cached page is reused before revalidating')
+    parser.add_argument('--rate-per-host', type=float, default=None,
+                        help='requests per second allowed to each site (adapts down on 429/5xx)')
+    parser.add_argument('--history-db', default=price_history.DB_PATH,
+                        help='SQLite file every observation is appended to')
+    parser.add_argument('--full-crawl', action='store_true',
+                        help='walk every category page instead of stopping at unchanged ones')
+    parser.add_argument('--no-store-api', action='store_true',
+                        help='scrape HTML pages even for shops whose WooCommerce Store API answers')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip rows an interrupted run already finished for each site')
+    parser.add_argument('--base-url', default=None,
+                        help='send every request to this server instead (e.g. benchmarks/mock_shop.py)')
+    parser.add_argument('--metrics-json', default=metrics.JSON_PATH,
+                        help='write per-stage timings and counters for the run to this JSON file')
+    parser.add_argument('--metrics-prom', default=metrics.PROM_PATH,
+                        help='write the same metrics as a Prometheus textfile (node_exporter collector)')
+    parser.add_argument('--log-level', default=logs.LEVEL, choices=['TRACE', 'DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        type=str.upper, help='TRACE adds the terms and winning score of each row, DEBUG one line per row')
+    parser.add_argument('--log-jsonl', default=logs.JSONL_PATH,
+                        help='also write every log record to this file as JSON lines')
+    args = parser.parse_args(argv)
+    logs.configure(level=args.log_level, jsonl_path=args.log_jsonl)
+    metrics.JSON_PATH, metrics.PROM_PATH = args.metrics_json, args.metrics_prom
+    driver_pool.configure(pool_size=args.browser_pool_size)
+    rate_limit.configure(rate_per_host=args.rate_per_host)
+    if args.base_url:
+        http_client.BASE_URL = args.base_url
+    if args.offline:
+        http_client.OFFLINE = True
+    if args.no_store_api:
+        store_api.ENABLED = False
+    if args.full_crawl:
+        paginated_crawler.FULL_CRAWL_EVERY = 0
+    if args.cache_ttl is not None:
+        # Also replaces the per-shop cache TTLs of sites.py
+        http_client.TTL_OVERRIDE = args.cache_ttl
+    run(args.sites, path=args.sheet, workers=args.workers, history_db=args.history_db, resume=args.resume,
+        export_xlsx=args.export_xlsx)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import sys
+
+import pandas as pd
+
+import checkpoint
+import logs
+import metrics
+import price_history
+import prices
+import workbook
+
+# Workbook helpers shared by the site scripts and run_all.py.
+# Every site module exposes SITE, URL_COLUMN and scrape_rows(rows), a generator
+# yielding (row index, {'title', 'url', 'price'}) for the rows it processed.
+# Next to each raw price column the sheet keeps typed Int64 Toman columns
+# (<site>pricemin/<site>pricemax, see prices.py) for numeric comparisons.
+# Results are appended to the price history (price_history.py) and the site
+# columns are then filled from its latest snapshot.
+# A run loads only the input columns and its sites' columns, and saves only its
+# sites' columns back, changed cells only (see workbook.py); the sheet may also
+# be a .parquet/.feather working copy.
+
+SHEET_PATH = 'SampleSites.xlsx'
+INPUT_COLUMNS = ['Product name', 'Cpu', 'Ram', 'SSD', 'Color']
+
+log = logs.get_logger(__name__)
+
+
+def site_column_layout(site_columns):
+    # {site: url column} -> {column: column it follows} for every sheet column
+    # those sites write, laid out as ensure_site_columns does: a new site
+    # column goes at the end, its URL and typed price columns right after it
+    layout = {}
+    for site, url_column in site_columns.items():
+        group = [site] + ([url_column] if url_column is not None else []) + list(prices.column_names(site))
+        layout.update(zip(group, [None] + group[:-1]))
+    return layout
+
+
+def load_sheet(path=SHEET_PATH, site_columns=None):
+    # site_columns: {site: url column} a run refreshes; None loads every column
+    if site_columns is None:
+        return workbook.load(path)
+    return workbook.load(path, INPUT_COLUMNS + list(site_column_layout(site_columns)))
+
+
+def input_rows(df):
+    # Read-only copy of the matching inputs, safe to share between workers
+    return df[INPUT_COLUMNS].copy()
+
+
+def _insert_after(df, anchor, column, value):
+    if column not in df.columns:
+        df.insert(list(df.columns).index(anchor) + 1, column, value)
+
+
+def ensure_site_columns(df, site, url_column):
+    if site not in df.columns:
+        df[site] = ''
+    df[site] = df[site].astype('object')
+    if url_column is not None:
+        _insert_after(df, site, url_column, '')
+        df[url_column] = df[url_column].astype('object')
+    min_column, max_column = prices.column_names(site)
+    typed = prices.parse_column(df[site])
+    _insert_after(df, url_column or site, min_column, typed['min'])
+    _insert_after(df, min_column, max_column, typed['max'])
+    df[min_column] = typed['min']
+    df[max_column] = typed['max']
+
+
+def apply_result(df, site, url_column, idx, result):
+    price = result.get('price', '')
+    df.at[idx, site] = price
+    if url_column is not None:
+        df.at[idx, url_column] = result.get('url', '')
+    min_column, max_column = prices.column_names(site)
+    low, high = prices.parse_price(price)
+    df.at[idx, min_column] = pd.NA if low is None else low
+    df.at[idx, max_column] = pd.NA if high is None else high
+
+
+def row_keys(df):
+    # Identity of a sheet row across runs: its normalized input cells
+    def key(row):
+        return '|'.join(' '.join(str(v).lower().split()) if v == v else '' for v in row)
+    return df[INPUT_COLUMNS].apply(key, axis=1)
+
+
+def record_results(conn, run_id, df, site, results):
+    return price_history.record(conn, run_id, site, row_keys(df), df['Product name'], results)
+
+
+def apply_latest(df, conn, site_columns):
+    # site_columns: {site: url column}; fills those sites from the history
+    rows_by_key = {}
+    for idx, key in row_keys(df).items():
+        rows_by_key.setdefault(key, []).append(idx)
+    for key, site, title, url, price in price_history.latest(conn, list(site_columns)):
+        for idx in rows_by_key.get(key, ()):
+            apply_result(df, site, site_columns[site], idx, {'title': title, 'url': url, 'price': price})
+
+
+def price_table(df, sites):
+    # Lowest Toman price per row and site, as one Int64 frame keyed by site
+    return pd.DataFrame({site: df[prices.column_names(site)[0]] for site in sites}, index=df.index)
+
+
+def save_sheet(df, path=SHEET_PATH, site_columns=None):
+    # Writes back only the given sites' columns (all of df's when None)
+    with metrics.span('write'):
+        if site_columns is None:
+            return workbook.save(df, path)
+        layout = site_column_layout(site_columns)
+        return workbook.save(df, path, list(layout), after=layout)
+
+
+def run_site(site, url_column, scrape_rows, path=SHEET_PATH, resume=None):
+    # Standalone entry point used by each *_full_scrape.py script;
+    # `python <script>.py --resume` continues an interrupted run
+    if resume is None:
+        resume = '--resume' in sys.argv[1:]
+    df = load_sheet(path, {site: url_column})
+    ensure_site_columns(df, site, url_column)
+    journal = checkpoint.open_journal(site, path, resume=resume)
+    with metrics.site_context(site), metrics.span('scrape'):
+        results = list(checkpoint.scrape_resumable(site, scrape_rows, input_rows(df), row_keys(df), journal))
+    checkpoint.close_journal(journal, finished=True)
+    conn = price_history.connect()
+    record_results(conn, price_history.new_run_id(), df, site, results)
+    apply_latest(df, conn, {site: url_column})
+    conn.close()
+    save_sheet(df, path, {site: url_column})
+    log.info("%s: %d rows, %d priced", site, len(results), sum(1 for _, result in results if result.get('price')))
+    log.info("Done. Prices and product URLs updated in %s.", path)
+    for line in metrics.summary_lines():
+        log.info("%s", line)
+    metrics.export(site=site, rows=len(results))
@@ -0,0 +1,306 @@
+import functools
+import re
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import batch_match
+import html_parse
+import http_client
+import logs
+import paginated_crawler
+import query_cache
+import store_api
+import tiered_fetch
+
+# Shared engine behind every shop. A shop is a spec dict (see sites.py) saying
+# where its products are listed (paginated categories or a search URL), how to
+# read a product card, which sheet columns it matches on, and the optional
+# extra steps (product-page prices, color check). WooCommerce shops can also
+# be read as JSON through the Store API (store_api.py) when it is enabled, with
+# the HTML listing or search as the fallback. scrape_rows(spec, df) runs
+# the whole pipeline, so fetching, parsing and matching work is shared by all
+# shops, and a new shop is a new spec rather than a new script. Rows are
+# yielded as soon as they resolve (each search, each product page), so the
+# run's journal (checkpoint.py) keeps them if a later step is interrupted;
+# rows whose crawl, search or product page failed carry an 'error' and are
+# retried by --resume.
+#
+# Cards: spec['cards'] selects one element per product; with 'card_parent' the
+# fields are read inside the closest ancestor matching it instead. Each field
+# is a list of (selector, attributes) alternatives tried in order; selector
+# None means the card element itself and the attribute 'text' its stripped text.
+
+DEFAULT_TIMEOUT = 20
+PRODUCT_PAGE_WORKERS = 4
+PAGE_URLS = {
+    'path': paginated_crawler.path_page_url,
+    'query': paginated_crawler.query_page_url,
+}
+
+log = logs.get_logger(__name__)
+
+
+def to_english_digits(text):
+    return text.translate(str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789'))
+
+
+def normalize(text):
+    text = to_english_digits(str(text).replace('گیگابایت', 'gb')).lower()
+    return re.sub(r'[^a-zA-Z0-9آ-ی]', '', text)
+
+
+def _value(tag, attrs):
+    for attr in attrs:
+        value = tag.get_text(strip=True) if attr == 'text' else (tag.get(attr) or '').strip()
+        if value:
+            return value
+    return ''
+
+
+def _field(card, scope, alternatives):
+    for selector, attrs in alternatives:
+        tag = card if selector is None else scope.select_one(selector)
+        value = _value(tag, attrs) if tag is not None else ''
+        if value:
+            return value
+    return ''
+
+
+def _scope(card, parent_selector):
+    if parent_selector is None:
+        return card
+    for parent in card.parents:
+        if parent.name != '[document]' and parent.css.match(parent_selector):
+            return parent
+    return None
+
+
+def parse_cards(spec, soup):
+    # -> [{'title', 'url', 'price'}] for every card with a title and a URL
+    fields = spec['fields']
+    products = []
+    for card in soup.select(spec['cards']):
+        scope = _scope(card, spec.get('card_parent'))
+        if scope is None:
+            # Outside any card_parent (e.g. mysurface image links): not a product card
+            continue
+        title = _field(card, scope, fields['title'])
+        href = _field(card, scope, fields['url'])
+        if title and href:
+            products.append({'title': title, 'url': urllib.parse.urljoin(f"https://{spec['site']}/", href),
+                             'price': _field(card, scope, fields['price'])})
+    return products
+
+
+def _has_next(spec, soup, products):
+    listing = spec['listing']
+    return soup.select_one(listing['next']) is not None and len(products) >= listing.get('min_cards', 0)
+
+
+def _listing_fetch(spec):
+    required = spec['listing'].get('required_selector')
+    if required is None:
+        return paginated_crawler.fetch_soup
+    # JS-rendered or bot-gated listings: browser only when the cards are missing
+    return lambda url, regions=None: tiered_fetch.fetch_soup(url, required, regions=regions)
+
+
+def crawl(spec):
+    # pagination: 'path' (/page/N/), 'query' (?page=N) or None for a single page
+    listing = spec['listing']
+    pagination = listing.get('pagination')
+    if pagination is None:
+        options = {'max_pages': 1}
+    else:
+        options = {'page_url': PAGE_URLS[pagination], 'has_next': functools.partial(_has_next, spec),
+                   'max_pages': listing.get('max_pages', paginated_crawler.MAX_PAGES)}
+    return paginated_crawler.crawl_categories(listing['urls'], functools.partial(parse_cards, spec),
+                                              fetch=_listing_fetch(spec), regions=spec.get('regions'), **options)
+
+
+def search_query(spec, row):
+    query = str(row['Product name'])
+    if spec['search'].get('with_features'):
+        query = ' '.join([query] + [str(row[col]) for col in spec['features'] if row[col]])
+    return query
+
+
+def fetch_search(spec, query):
+    url = spec['search']['url'].format(query=urllib.parse.quote(query))
+    log.debug("%s search URL: %s", spec['site'], url)
+    resp = http_client.get(url, timeout=DEFAULT_TIMEOUT)
+    resp.raise_for_status()
+    return parse_cards(spec, html_parse.parse(resp.text, spec.get('regions'), url=url))
+
+
+def _search_batches(spec, df, kwargs):
+    # One batch per distinct (normalized) query, as each search finishes;
+    # every row sharing the query is matched against its results
+    groups = {}
+    for idx, row in df.iterrows():
+        query = search_query(spec, row)
+        groups.setdefault(query_cache.normalize_query(query), (query, []))[1].append(idx)
+    log.info("%s: %d distinct searches for %d rows", spec['site'], len(groups), len(df))
+    search = functools.partial(fetch_search, spec)
+    executor = ThreadPoolExecutor(max_workers=query_cache.PREFETCH_WORKERS)
+    try:
+        futures = {executor.submit(query_cache.cached, spec['site'], query, search): row_ids
+                   for query, row_ids in groups.values()}
+        for future in as_completed(futures):
+            row_ids = futures[future]
+            try:
+                products = future.result()
+            except Exception as e:
+                log.warning("Error searching %s: %s", spec['site'], e)
+                yield {idx: None for idx in row_ids}, str(e)
+                continue
+            yield batch_match.match_catalog(df.loc[row_ids], products, 'title', spec['features'], normalize,
+                                            **kwargs), None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def match_batches(spec, df):
+    # Generator of ({row index: product or None}, error or None)
+    kwargs = {'name_column': spec.get('name_column', 'Product name'), 'require_all': spec.get('require_all', False),
+              'min_match': spec.get('min_match', 2)}
+    products = store_api.fetch_products(spec) if 'store_api' in spec else None
+    if products is not None:
+        log.info("%s: %d products from the Store API", spec['site'], len(products))
+        yield batch_match.match_catalog(df, products, 'title', spec['features'], normalize, **kwargs), None
+        return
+    if 'store_api' in spec and store_api.ENABLED:
+        log.info("%s: Store API unavailable, reading the HTML pages", spec['site'])
+    if 'search' in spec:
+        yield from _search_batches(spec, df, kwargs)
+        return
+    try:
+        products = crawl(spec)
+    except Exception as e:
+        log.warning("Error crawling %s: %s", spec['site'], e)
+        yield {idx: None for idx in df.index}, str(e)
+        return
+    log.info("%s: %d products scraped", spec['site'], len(products))
+    if log.isEnabledFor(logs.TRACE):
+        for prod in products:
+            log.log(logs.TRACE, "Scraped product: %s | %s | %s", prod['title'], prod['url'], prod['price'])
+    yield batch_match.match_catalog(df, products, 'title', spec['features'], normalize, **kwargs), None
+
+
+def product_page_price(spec, product_url):
+    # Raises when the page cannot be fetched; '' when it shows no price
+    page = spec['product_page']
+    soup = tiered_fetch.fetch_soup(product_url, page['required_selector'])
+    # First container holding any amount wins; the whole page is the last resort
+    for container in [soup.select_one(selector) for selector in page['containers']] + [soup]:
+        amounts = [tag.get_text(strip=True) for tag in container.select(page['amount'])] if container else []
+        amounts = [amount for amount in amounts if amount]
+        if amounts:
+            log.debug("Price found on %s: %s", product_url, amounts)
+            return ' - '.join(amounts)
+    log.warning("Price element not found or empty on %s (page title: %s)", product_url,
+                soup.title.get_text(strip=True) if soup.title else '')
+    return ''
+
+
+def fetch_colors(spec, product_url):
+    colors = spec['colors']
+    resp = http_client.get(product_url, timeout=DEFAULT_TIMEOUT, ttl=colors.get('cache_ttl'))
+    resp.raise_for_status()
+    soup = html_parse.parse(resp.text, colors.get('regions'), url=product_url)
+    return [tag.get_text(strip=True) for tag in soup.select(colors['selector'])]
+
+
+def available_colors(spec, product_url):
+    # One fetch per product URL per run (and across runs with SCRAPER_QUERY_CACHE_TTL)
+    return query_cache.cached(f"{spec['site']}-colors", product_url, functools.partial(fetch_colors, spec))
+
+
+def color_lookup(names):
+    # normalized sheet or site color name -> name shown on the site
+    lookup = {}
+    for sheet_name, site_name in names.items():
+        lookup.setdefault(normalize(sheet_name), site_name)
+        lookup.setdefault(normalize(site_name), site_name)
+    return lookup
+
+
+def _needs_page(spec, lookup, product):
+    # Product pages only for prices the listing lacks and colors it does not
+    # carry (Store API products have theirs)
+    return (('product_page' in spec and not product['price'])
+            or (lookup is not None and 'colors' not in product))
+
+
+def page_details(spec, product, want_colors):
+    # Product page lookups for one matched product -> {'price', 'colors', 'error'}
+    details = {'price': '', 'colors': product.get('colors'), 'error': None}
+    try:
+        if 'product_page' in spec and not product['price']:
+            details['price'] = product_page_price(spec, product['url'])
+        if want_colors and details['colors'] is None:
+            details['colors'] = available_colors(spec, product['url'])
+    except Exception as e:
+        log.warning("Error fetching %s: %s", product['url'], e)
+        details['error'] = str(e)
+    return details
+
+
+def row_result(spec, df, idx, product, lookup, details=None, error=None):
+    name = df.at[idx, 'Product name']
+    result = {'title': '', 'url': '', 'price': ''}
+    error = error or (details or {}).get('error')
+    if error:
+        # Kept out of the journal's finished rows, so --resume retries it
+        result['error'] = error
+        return result
+    if product is None:
+        log.debug("Row %d (%s): no matching product", idx + 1, name)
+        return result
+    details = details or {}
+    if lookup is not None:
+        wanted = str(df.at[idx, 'Color']).strip()
+        wanted = lookup.get(normalize(wanted), wanted)
+        colors = product['colors'] if 'colors' in product else details.get('colors') or []
+        if normalize(wanted) not in {normalize(color) for color in colors}:
+            log.debug("Row %d (%s): %s has no '%s', colors: %s", idx + 1, name, product['title'], wanted, colors)
+            return result
+    price = product['price'] or details.get('price', '')
+    log.debug("Row %d (%s): matched %s (%s), price %s", idx + 1, name, product['title'], product['url'], price)
+    return {'title': product['title'], 'url': product['url'], 'price': price}
+
+
+def scrape_rows(spec, df):
+    # Generator of (row index, {'title', 'url', 'price'[, 'error']}), see sheet.py.
+    # Rows needing no product page are yielded with their batch; the others as
+    # soon as their (shared, per URL) product page resolves
+    if 'cache_ttl' in spec:
+        http_client.set_site_cache_ttl(spec['site'], spec['cache_ttl'])
+    if 'parser' in spec:
+        html_parse.set_site_parser(spec['site'], spec['parser'])
+    lookup = color_lookup(spec['colors'].get('names', {})) if 'colors' in spec else None
+    pages = {}
+    waiting = {}
+    executor = ThreadPoolExecutor(max_workers=PRODUCT_PAGE_WORKERS)
+    try:
+        for matches, error in match_batches(spec, df):
+            for idx, product in matches.items():
+                if error or product is None or not _needs_page(spec, lookup, product):
+                    yield idx, row_result(spec, df, idx, product, lookup, error=error)
+                    continue
+                future = pages.get(product['url'])
+                if future is None:
+                    future = pages[product['url']] = executor.submit(page_details, spec, product, lookup is not None)
+                waiting.setdefault(future, []).append((idx, product))
+            # Pages that finished while this batch was matched
+            for future in [future for future in waiting if future.done()]:
+                for idx, product in waiting.pop(future):
+                    yield idx, row_result(spec, df, idx, product, lookup, details=future.result())
+        if pages:
+            log.info("%s: %d product pages queued", spec['site'], len(pages))
+        for future in as_completed(waiting):
+            for idx, product in waiting[future]:
+                yield idx, row_result(spec, df, idx, product, lookup, details=future.result())
+    finally:
+        # An interrupted run drops the queued pages instead of waiting for them
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,212 @@
+# Shop specs run by site_engine.py. Each spec needs:
+#   site, url_column        - sheet columns (see sheet.ensure_site_columns)
+#   listing or search       - paginated/single category pages, or a search URL
+#                             with a {query} placeholder (the product name, plus
+#                             the feature cells when with_features is set)
+#   cards, fields, regions  - how product cards are read (see site_engine)
+#   features                - sheet columns matched against product titles
+# and optionally name_column/require_all/min_match (matching mode, and how
+# many terms a substring match needs, 2 by default), product_page (prices for
+# cards without one), colors (color check on product pages), parser
+# (BeautifulSoup backend for the shop's pages, 'lxml' or 'html.parser',
+# instead of html_parse.PARSER), store_api (WooCommerce shops: catalog as JSON
+# first, see store_api.py) and cache_ttl (seconds the shop's cached pages are
+# reused without revalidating, instead of SCRAPER_HTTP_CACHE_TTL; run_all.py
+# --cache-ttl overrides it).
+# Listing, search and Store API pages carry the prices, so a shop-wide
+# cache_ttl must stay well under the run interval; colors can set their own
+# cache_ttl for the product pages the color check reads.
+# Adding a shop: write its spec here and list it in SPECS.
+
+WOODMART_FIELDS = {
+    'title': [('h3.wd-entities-title', ('text',))],
+    'url': [('a.product-image-link', ('href',))],
+    'price': [('span.woocommerce-Price-amount', ('text',))],
+}
+# WoodMart search results: the title link carries the product URL
+WOODMART_SEARCH_FIELDS = {
+    'title': [('h3.wd-entities-title a', ('title', 'text'))],
+    'url': [('h3.wd-entities-title a', ('href',))],
+    'price': [('.price .woocommerce-Price-amount', ('text',))],
+}
+
+MICROPPLE = {
+    'site': 'micropple.ir',
+    'url_column': 'microppleproducturl',
+    'listing': {
+        'urls': ['https://micropple.ir/product-category/microsoft/tablet-microsoft/'],
+        'pagination': 'path',
+        'next': 'a.next',
+    },
+    'cards': 'div.product-grid-item',
+    'fields': WOODMART_FIELDS,
+    'regions': ['div.product-grid-item', 'a.next'],
+    'features': ['Cpu', 'Ram', 'SSD', 'Color'],
+    'store_api': {'categories': ['tablet-microsoft']},
+}
+
+MYSURFACE = {
+    'site': 'mysurface.ir',
+    'url_column': 'mysurfaceproducturl',
+    'listing': {
+        'urls': [
+            'https://mysurface.ir/surface-pro/',
+            'https://mysurface.ir/surface-laptop/',
+            'https://mysurface.ir/surface-go/',
+        ],
+        'pagination': 'path',
+        'next': 'a.next',
+        'max_pages': 30,
+        # Rendered in a browser only when the static HTML lacks the cards
+        'required_selector': 'div.product-small',
+    },
+    # Only the title link sits inside the 'box-text' block; image links are skipped
+    'cards': 'a.woocommerce-LoopProduct-link, a.woocommerce-loop-product__link',
+    'card_parent': 'div.box-text',
+    'fields': {
+        'title': [(None, ('title', 'text'))],
+        'url': [(None, ('href',))],
+        'price': [('.price-wrapper .woocommerce-Price-amount', ('text',))],
+    },
+    'regions': ['div.product-small', 'a.next'],
+    'features': ['Cpu', 'Ram', 'SSD', 'Color'],
+    'product_page': {
+        'required_selector': 'p.price',
+        'containers': ['p.price', 'span.price'],
+        'amount': 'span.woocommerce-Price-amount.amount',
+    },
+    'store_api': {'categories': ['surface-pro', 'surface-laptop', 'surface-go']},
+}
+
+# Surface Pro category only, prices straight from the listing cards
+MYSURFACE_PRO = {
+    'site': 'mysurface.ir',
+    'url_column': 'mysurfaceproducturl',
+    'listing': {
+        'urls': ['https://mysurface.ir/surface-pro/'],
+        'pagination': 'path',
+        'next': 'a.next',
+    },
+    'cards': 'div.product-small',
+    'fields': {
+        'title': [('p.name', ('text',))],
+        'url': [('a.woocommerce-LoopProduct-link', ('href',))],
+        # Sale price when there is one
+        'price': [('ins span.woocommerce-Price-amount', ('text',)), ('span.woocommerce-Price-amount', ('text',))],
+    },
+    'regions': ['div.product-small', 'a.next'],
+    'features': ['Cpu', 'Ram', 'SSD', 'Color'],
+    'store_api': {'categories': ['surface-pro']},
+}
+
+PARSANME = {
+    'site': 'parsanme.com',
+    'url_column': 'parsanmeproducturl',
+    'listing': {
+        'urls': [
+            'https://parsanme.com/store/microsoft-surface',
+            'https://parsanme.com/store/surface-pro',
+        ],
+        'pagination': 'query',
+        'next': 'a[aria-label=Next]',
+        # Short pages still show the Next link
+        'min_cards': 10,
+    },
+    # Prices are looked up from the title's enclosing div.container
+    'cards': 'a.title.ellipsis-2',
+    'card_parent': 'div.container',
+    'fields': {
+        'title': [(None, ('title', 'text'))],
+        'url': [(None, ('href',))],
+        'price': [('div.price-container strong.price', ('text',))],
+    },
+    'regions': ['div.container', 'a[aria-label=Next]'],
+    # Color is not a feature for this site
+    'features': ['Cpu', 'Ram', 'SSD'],
+}
+
+SURFACEIRAN = {
+    'site': 'surfaceiran.com',
+    'url_column': 'surfaceiranproducturl',
+    'listing': {
+        'urls': ['https://surfaceiran.com/products/65e24e454b49f2d824666a29/'
+                 '%D8%B3%D8%B1%D9%81%DB%8C%D8%B3-%D9%BE%D8%B1%D9%88'],
+        'pagination': None,
+    },
+    'cards': 'div.productItem',
+    'fields': {
+        'title': [('div.productname', ('text',))],
+        'url': [('a[href]', ('href',))],
+        'price': [('span.price', ('text',))],
+    },
+    'regions': ['div.productItem'],
+    # Titles rarely repeat the model name, so every feature must match
+    'features': ['Cpu', 'Ram', 'SSD'],
+    'name_column': None,
+    'require_all': True,
+}
+
+RAAYAATECH = {
+    'site': 'raayaatech.com',
+    'url_column': 'raayaatechproducturl',
+    # Searches by product name only, so every variant of a model shares one request
+    'search': {'url': 'https://raayaatech.com/search?q={query}'},
+    'cards': 'div.col-xl-3.price_on, div.col-lg-4.price_on, div.col-md-4.price_on',
+    'fields': {
+        'title': [('a.title.overflow-hidden', ('title', 'text'))],
+        'url': [('a.title.overflow-hidden', ('href',))],
+        'price': [('div.price-area span.price', ('text',))],
+    },
+    'regions': ['div.price_on'],
+    'features': ['Cpu', 'Ram', 'SSD'],
+    'name_column': None,
+    'require_all': True,
+    # Search pages carry no ETag, so revalidating is a full download; reruns
+    # within minutes (--resume) reuse them, hourly runs always refetch prices
+    'cache_ttl': 600,
+}
+
+SURFACEKAR = {
+    'site': 'surfacekar.com',
+    'url_column': 'surfacekarproducturl',
+    'search': {'url': 'https://surfacekar.com/?s={query}&post_type=product', 'with_features': True},
+    'cards': 'div.product-grid-item',
+    'fields': WOODMART_SEARCH_FIELDS,
+    'regions': ['div.product-grid-item'],
+    'features': ['Cpu', 'Ram', 'SSD'],
+    # The whole (Surface-only) catalog replaces one search per row
+    'store_api': {},
+}
+
+YASINRAYAN = {
+    'site': 'yasinrayan.com',
+    'url_column': 'yasinrayanproducturl',
+    'search': {'url': 'https://www.yasinrayan.com/?s={query}&post_type=product', 'with_features': True},
+    'cards': 'div.product-grid-item',
+    'fields': WOODMART_SEARCH_FIELDS,
+    'regions': ['div.product-grid-item'],
+    # Color is checked against the product's colors instead
+    'features': ['Cpu', 'Ram', 'SSD'],
+    'colors': {
+        'selector': 'div.wd-swatches-product .wd-swatch-text',
+        'regions': ['div.wd-swatches-product'],
+        # sheet color -> name shown on the site
+        'names': {
+            'platinum': 'پلاتینی',
+            'graphite': 'مشکی',
+            'black': 'مشکی',
+            'sapphire': 'آبی (Sapphire)',
+            'gold': 'شنی طلایی',
+        },
+        # Product pages are only read for their swatches, which change rarely
+        'cache_ttl': 6 * 3600,
+    },
+    # Surface category only (the shop sells other laptops sharing CPU/RAM/SSD
+    # strings), colors from the variation attributes
+    'store_api': {'base': 'https://www.yasinrayan.com', 'categories': ['surface']},
+}
+
+# Shops refreshed by run_all.py, by site
+SPECS = {spec['site']: spec for spec in [
+    SURFACEIRAN, MICROPPLE, MYSURFACE, YASINRAYAN, SURFACEKAR, PARSANME, RAAYAATECH,
+]}
@@ -0,0 +1,174 @@
+import functools
+import re
+
+# Structured spec extraction for listing titles and sheet rows.
+# A title such as 'سرفیس پرو 10 Core Ultra 7 رم 16GB هارد 512GB SSD' or
+# 'surface-pro-11-intel-ultra-7-32-512gb' is parsed once into
+#     {'family': 'pro', 'generation': '10', 'cpu': 'ultra7',
+#      'ram_gb': 16, 'ssd_gb': 512, 'color': None}
+# and sheet rows are parsed the same way from their cells, so matching becomes
+# an exact lookup of the composite key in a hash table built from the catalog.
+# Keys are memoized per text, so titles seen again (overlapping search results,
+# the same catalog matched for several shops) and repeated rows are parsed once.
+
+PERSIAN_DIGITS = '۰۱۲۳۴۵۶۷۸۹'
+ARABIC_DIGITS = '٠١٢٣٤٥٦٧٨٩'
+_DIGITS = str.maketrans(PERSIAN_DIGITS + ARABIC_DIGITS, '0123456789' * 2)
+
+# Persian words rewritten to the English tokens the patterns below look for
+PERSIAN_WORDS = [
+    ('سرفیس', ' surface '),
+    ('لپ‌تاپ', ' laptop '),
+    ('لپ تاپ', ' laptop '),
+    ('لپتاپ', ' laptop '),
+    ('استودیو', ' studio '),
+    ('پرو', ' pro '),
+    ('بوک', ' book '),
+    ('گو', ' go '),
+    ('ایکس', ' x '),
+    ('گیگابایت', ' gb '),
+    ('گیگ', ' gb '),
+    ('ترابایت', ' tb '),
+    ('ترا', ' tb '),
+]
+
+COLORS = {
+    'platinum': 'platinum', 'پلاتینی': 'platinum', 'پلاتین': 'platinum', 'نقره ای': 'platinum', 'نقره‌ای': 'platinum',
+    'black': 'black', 'graphite': 'black', 'مشکی': 'black', 'گرافیت': 'black',
+    'sapphire': 'sapphire', 'blue': 'sapphire', 'آبی': 'sapphire',
+    'dune': 'dune', 'gold': 'dune', 'طلایی': 'dune', 'شنی': 'dune',
+    'forest': 'forest', 'green': 'forest', 'سبز': 'forest',
+    'sage': 'sage',
+}
+# Words only count when they are not part of a longer word ('blue' in 'bluetooth')
+_WORD = r'(?<![a-zآ-ی]){}(?![a-zآ-ی])'
+# All of PERSIAN_WORDS in one pass, longest word first where several start at
+# the same place ('گیگابایت' before 'گیگ')
+_PERSIAN_WORD_MAP = dict(PERSIAN_WORDS)
+_PERSIAN_WORD_RE = re.compile(_WORD.format(
+    '(?:' + '|'.join(sorted((re.escape(fa) for fa in _PERSIAN_WORD_MAP), key=len, reverse=True)) + ')'))
+_SEPARATORS_RE = re.compile(r'[-_/|,()]+')
+_SPACES_RE = re.compile(r'\s+')
+_COLOR_RE = re.compile(_WORD.format(
+    '(?:' + '|'.join(sorted((re.escape(c) for c in COLORS), key=len, reverse=True)) + ')'))
+
+# Generation: 'x' (Pro X, not 'ProX Elite' meaning the Pro 11 CPU) or a 1-2
+# digit number, also glued to the next word ('pro 10core'), but not a size
+_FAMILY_RE = re.compile(r'surface\s*(laptop\s*studio|laptop\s*go|laptop|pro|go|book|studio)\s*'
+                        r'(x\b(?!\s*(?:elite|plus))|\d{1,2}(?![\d.]|\s*(?:gb|tb|t)\b))?')
+_CPU_PATTERNS = [
+    (re.compile(r'ultra\s*([579])\b'), 'ultra{}'),
+    # 'ProX Elite' glues the CPU to the family name
+    (re.compile(r'(?:\b|pro)x\s*elite\b'), 'xelite'),
+    (re.compile(r'(?:\b|pro)x\s*plus\b'), 'xplus'),
+    (re.compile(r'\bsq\s*([123])\b'), 'sq{}'),
+    (re.compile(r'\b(?:core\s*)?c?i([3579])\b'), 'i{}'),
+]
+_SIZE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(gb|tb|t)\b')
+# 'ultra 7 32 512gb' style slugs that give RAM without a unit
+_PAIR_RE = re.compile(r'\b(4|8|16|32|64)\s+(128|256|512|1024|2048|1|2)\s*(gb|tb|t)\b')
+RAM_SIZES = (2, 4, 8, 16, 32, 64)
+
+KEY_FIELDS = ('family', 'generation', 'cpu', 'ram_gb', 'ssd_gb')
+KEY_CACHE_SIZE = 200_000
+
+
+def to_english_digits(text):
+    return str(text).translate(_DIGITS)
+
+
+def canonical_text(text):
+    text = to_english_digits(text).lower()
+    text = _PERSIAN_WORD_RE.sub(lambda m: _PERSIAN_WORD_MAP[m.group(0)], text)
+    return _SPACES_RE.sub(' ', _SEPARATORS_RE.sub(' ', text))
+
+
+def _size_gb(value, unit):
+    value = float(value)
+    return int(value * 1024) if unit in ('tb', 't') else int(value)
+
+
+def extract_specs(text):
+    text = canonical_text(text)
+    found = {field: None for field in KEY_FIELDS}
+    found['color'] = None
+
+    m = _FAMILY_RE.search(text)
+    if m:
+        found['family'] = _SPACES_RE.sub(' ', m.group(1))
+        found['generation'] = m.group(2)
+    for pattern, template in _CPU_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            found['cpu'] = template.format(*m.groups())
+            break
+
+    for value, unit in _SIZE_RE.findall(text):
+        size = _size_gb(value, unit)
+        if found['ram_gb'] is None and unit == 'gb' and size in RAM_SIZES:
+            found['ram_gb'] = size
+        elif found['ssd_gb'] is None and size >= 128:
+            found['ssd_gb'] = size
+    if found['ram_gb'] is None:
+        m = _PAIR_RE.search(text)
+        if m:
+            found['ram_gb'] = int(m.group(1))
+            if found['ssd_gb'] is None:
+                found['ssd_gb'] = _size_gb(m.group(2), m.group(3))
+
+    m = _COLOR_RE.search(text)
+    if m:
+        found['color'] = COLORS[m.group(0)]
+    return found
+
+
+def row_text(values):
+    # Sheet cells joined into one title-like string; empty and NaN cells skipped
+    return ' '.join(str(v) for v in values if v and v == v)
+
+
+def spec_key(found):
+    key = tuple(found[field] for field in KEY_FIELDS)
+    return None if None in key else key
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def text_key(text):
+    # -> (spec key or None, color) of a title or row text
+    found = extract_specs(text)
+    return spec_key(found), found['color']
+
+
+def build_table(products, key, use_color=False):
+    # {composite key: position of the first product with that key}
+    table = {}
+    for pos, prod in enumerate(products):
+        composite, color = text_key(prod[key])
+        if composite is None:
+            continue
+        if use_color:
+            composite += (color,)
+        table.setdefault(composite, pos)
+    return table
+
+
+def lookup(table, composite, color, use_color=False):
+    if composite is None:
+        return None
+    if not use_color:
+        return table.get(composite)
+    pos = table.get(composite + (color,))
+    if pos is None and color is not None:
+        # Listings that do not name a color match any color
+        pos = table.get(composite + (None,))
+    return pos
+
+
+def join_rows(rows, products, key, columns, use_color=False):
+    # {row index: product position, None when the row has no complete key or
+    # no product shares it}
+    table = build_table(products, key, use_color)
+    joined = {}
+    for idx, values in zip(rows.index, rows[columns].itertuples(index=False)):
+        joined[idx] = lookup(table, *text_key(row_text(values)), use_color=use_color)
+    return joined
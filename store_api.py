@@ -0,0 +1,133 @@
+import html
+import os
+
+import http_client
+import logs
+
+# Catalog ingestion through the WooCommerce Store API
+# (https://<shop>/wp-json/wc/store/v1/products), the public JSON endpoint
+# behind WooCommerce's block themes. A whole category comes back 100 products
+# per request, with prices and variation attributes (colors), instead of one
+# HTML listing page per 12-24 products plus a product page per color check.
+# fetch_products(spec) returns None when the shop has the endpoint disabled,
+# answers with something else or fails on any page, and site_engine falls
+# back to HTML.
+# Spec block (see sites.py):
+#     'store_api': {'categories': ['surface-pro']}   # slugs or ids, optional
+# SCRAPER_STORE_API=0 (run_all.py --no-store-api) always scrapes HTML.
+
+ENABLED = os.environ.get('SCRAPER_STORE_API', '1') != '0'
+API_PATH = '/wp-json/wc/store/v1'
+PER_PAGE = 100
+MAX_PAGES = 20
+# Attributes holding a product's colors, by taxonomy or name
+COLOR_ATTRIBUTES = ('pa_color', 'pa_rang', 'color', 'رنگ')
+RIAL_CURRENCIES = ('IRR',)
+
+log = logs.get_logger(__name__)
+
+
+def _base(spec):
+    return spec['store_api'].get('base', f"https://{spec['site']}")
+
+
+def _get_json(url, params):
+    # -> (decoded body, total pages header) or (None, None) when this is not the Store API
+    try:
+        resp = http_client.get(url, params=params, timeout=30)
+    except Exception as e:
+        log.debug("Store API request to %s failed: %s", url, e)
+        return None, None
+    if resp.status_code != 200:
+        log.debug("Store API %s answered %s", url, resp.status_code)
+        return None, None
+    try:
+        data = resp.json()
+    except ValueError:
+        return None, None
+    total_pages = resp.headers.get('X-WP-TotalPages')
+    return data, int(total_pages) if total_pages and total_pages.isdigit() else None
+
+
+def _paged(url, params, max_pages=MAX_PAGES):
+    # All items of a paginated collection, or None if any page fails: a
+    # catalog missing pages would be matched as if it were complete
+    items = []
+    for page in range(1, max_pages + 1):
+        data, total_pages = _get_json(url, dict(params, per_page=PER_PAGE, page=page))
+        if not isinstance(data, list):
+            if page > 1:
+                log.warning("Store API %s: page %d failed, not using the catalog", url, page)
+            return None
+        items.extend(data)
+        if len(data) < PER_PAGE or (total_pages is not None and page >= total_pages):
+            break
+    else:
+        log.warning("Store API %s: stopped after %d pages (%d items), the rest is not matched",
+                    url, max_pages, len(items))
+    return items
+
+
+def category_ids(spec):
+    # Category slugs in the spec -> ids (ids pass through); None if any is unknown
+    wanted = [str(category) for category in spec['store_api'].get('categories', [])]
+    slugs = [category for category in wanted if not category.isdigit()]
+    if not slugs:
+        return wanted
+    categories = _paged(_base(spec) + API_PATH + '/products/categories', {})
+    by_slug = {category.get('slug'): str(category.get('id')) for category in categories or []}
+    missing = [slug for slug in slugs if slug not in by_slug]
+    if missing:
+        log.warning("%s: unknown Store API categories %s", spec['site'], missing)
+        return None
+    return [category if category.isdigit() else by_slug[category] for category in wanted]
+
+
+def price_text(prices):
+    # Store API prices are strings in minor units -> text prices.parse_price reads
+    if not prices:
+        return ''
+    unit = 10 ** int(prices.get('currency_minor_unit') or 0)
+    price_range = prices.get('price_range') or {}
+    amounts = [price_range.get('min_amount'), price_range.get('max_amount')] if price_range else [prices.get('price')]
+    amounts = [int(amount) // unit for amount in amounts if amount not in (None, '')]
+    if not amounts:
+        return ''
+    currency = 'ریال' if prices.get('currency_code') in RIAL_CURRENCIES else 'تومان'
+    return ' - '.join(f"{amount:,}" for amount in dict.fromkeys(amounts)) + f' {currency}'
+
+
+def colors(item):
+    found = []
+    for attribute in item.get('attributes') or []:
+        names = (str(attribute.get('taxonomy') or '').lower(), str(attribute.get('name') or '').lower())
+        if any(name in COLOR_ATTRIBUTES for name in names):
+            found.extend(html.unescape(term['name']) for term in attribute.get('terms') or [])
+    return found
+
+
+def to_product(item):
+    return {
+        'title': html.unescape(item.get('name') or ''),
+        'url': item.get('permalink') or '',
+        'price': price_text(item.get('prices')),
+        'colors': colors(item),
+    }
+
+
+def fetch_products(spec):
+    # -> [{'title', 'url', 'price', 'colors'}], or None to fall back to HTML
+    if not ENABLED:
+        return None
+    params = {}
+    ids = category_ids(spec)
+    if ids is None:
+        return None
+    if ids:
+        params['category'] = ','.join(ids)
+    items = _paged(_base(spec) + API_PATH + '/products', params,
+                   max_pages=spec['store_api'].get('max_pages', MAX_PAGES))
+    if not items:
+        return None
+    products = [to_product(item) for item in items]
+    return [product for product in products if product['title'] and product['url']]
@@ -1,90 +1,195 @@
-import pandas as pd
-import requests
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.firefox.options import Options
-# NOTE: Make sure you have installed selenium and geckodriver.(im using firefox and geckodriver)
-# pip install selenium
-# Download geckodriver from https://github.com/mozilla/geckodriver/releases
-
-# Read the table from SampleSites.xlsx
-print('Reading data from SampleSites.xlsx...')
-df = pd.read_excel('SampleSites.xlsx')
-
-# Function to get price using Selenium
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import http_client
+import logs
+import prices
+import query_cache
+import sheet
+import tiered_fetch
+# Prices come from surfaceiran's JSON API: the short list search
+# (/products/getShortList, walked page by page over the whole result set) and,
+# for products whose row carries no price, the product detail JSON. Every
+# distinct product name is searched once per run, all rows sharing it reuse
+# the result, or its failure. The product page (plain HTTP first, then the
+# pooled headless browser, see tiered_fetch) is only the last resort for
+# products neither JSON answer prices. Rows are yielded as soon as their price resolves; failed
+# searches and pages are yielded with an 'error' so --resume retries them.
+
+log = logs.get_logger(__name__)
+
+SEARCH_URL = 'https://surfaceiran.com/products/getShortList'
+DETAIL_URL = 'https://surfaceiran.com/products/getProduct/{id}'
+PRODUCT_URL = 'https://surfaceiran.com/p/{id}'
+PAGE_SIZE = 50
+MAX_SEARCH_PAGES = 20
+# Price keys of a product row, first present wins; values are in Rial
+PRICE_FIELDS = ('priceVal', 'finalPrice', 'price')
+PRODUCT_PAGE_WORKERS = 4
+
+_detail_lock = threading.Lock()
+# Cleared once the detail endpoint answers with something other than JSON
+_detail_available = True
+
+# Function to get price from the product page (last resort); raises when the
+# page cannot be fetched
 def get_price_selenium(product_url):
-    options = Options()
-    # options.add_argument('--headless')  # Comment this out for now
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    driver = webdriver.Firefox(options=options)
-    try:
-        driver.set_page_load_timeout(60)  # 60 seconds
-        print("Opening URL...")
-        driver.get(product_url)
-        print("URL opened.")
-        print("Finding element...")
-        price_elem = driver.find_element(By.CSS_SELECTOR, '.priceVal')
-        print("Element found.")
-        price = price_elem.text.strip()
-        print(f"[SELENIUM DEBUG] Price found: {price}")
-        return price
-    except Exception as e:
-        print(f"[SELENIUM DEBUG] Error: {e}")
+    log.debug("Opening %s", product_url)
+    soup = tiered_fetch.fetch_soup(product_url, '.priceVal', regions=['.priceVal'])
+    price_elem = soup.select_one('.priceVal')
+    if price_elem is None:
+        log.debug(".priceVal not found on %s", product_url)
         return ''
-    finally:
-        driver.quit()
+    price = price_elem.get_text(strip=True)
+    log.debug("Price found on %s: %s", product_url, price)
+    return price
+
+# Price text of a product row or detail JSON, '' when it is listed without a
+# price (out of stock), None when the JSON has no price at all
+def json_price(product):
+    for field in PRICE_FIELDS:
+        value = product.get(field)
+        if value in (None, ''):
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            # Numeric strings ('0', '1282290000') are read like numbers
+            try:
+                value = float(prices.to_english_digits(value).replace(',', '').replace('٬', ''))
+            except ValueError:
+                # Text: a price only if it holds one ('ناموجود' does not)
+                if prices.parse_price(value)[0] is None:
+                    return ''
+                return value if 'ريال' in value or 'ریال' in value else f"{value} ريال"
+        return f"{int(value):,} ريال" if value > 0 else ''
+    return None
+
+# All rows the short list returns for a product name, every page of them
+def fetch_short_list(product_name):
+    rows, seen = [], set()
+    for page in range(1, MAX_SEARCH_PAGES + 1):
+        params = {'search': product_name, 'page': page, 'limit': PAGE_SIZE}
+        resp = http_client.get(SEARCH_URL, params=params, timeout=10)
+        resp.raise_for_status()
+        data = resp.json() or {}
+        page_rows = data.get('rows') or []
+        new_rows = [p for p in page_rows if p.get('_id') not in seen]
+        if log.isEnabledFor(logs.TRACE):
+            for p in new_rows:
+                log.log(logs.TRACE, "Product returned from API: %s", p)
+        rows.extend(new_rows)
+        seen.update(p.get('_id') for p in new_rows)
+        total = data.get('count', data.get('total'))
+        # A short or repeated page (the server ignoring page=) is the last one
+        if not new_rows or len(page_rows) < PAGE_SIZE or (isinstance(total, int) and len(rows) >= total):
+            break
+    log.debug("%d products found for product name: %s", len(rows), product_name)
+    return rows
+
+def search(product_name):
+    # Shared by every row with the same (normalized) product name; raises on failure
+    return query_cache.cached('surfaceiran-api', product_name, fetch_short_list)
 
-# Function to search and get price from surfaceiran.com
-def get_surfaceiran_price(product_name, features):
-    search_url = f'https://surfaceiran.com/products/getShortList?search={product_name}'
-    print(f"  [DEBUG] Search URL: {search_url}")
+# Price from the product detail JSON, None when it gives none
+def get_price_detail(product_id):
+    global _detail_available
+    if not _detail_available:
+        return None
+    url = DETAIL_URL.format(id=product_id)
     try:
-        resp = requests.get(search_url, timeout=10)
-        print(f"  [DEBUG] Search response status: {resp.status_code}")
+        resp = http_client.get(url, timeout=10)
+        resp.raise_for_status()
         data = resp.json()
-        print("[DEBUG] Products returned from API:")
-        for p in data.get('rows', []):
-            print(p)
-        if not data or not data.get('rows'):
-            print(f"  [DEBUG] No products found for product name: {product_name}")
-            return ''
-        # Remove color from features for matching (assume color is last in the list)
-        match_features = features[:-1]
-        def feature_match(product):
-            name = product.get('productname', '').lower()
-            return all(str(f).lower() in name for f in match_features if f)
-        filtered = [p for p in data['rows'] if feature_match(p)]
-        if not filtered:
-            print(f"  [DEBUG] No products matched features: {features}")
-            return ''
-        product = filtered[0]
-        product_id = product['_id']
-        product_url = f'https://surfaceiran.com/p/{product_id}'
-        print(f"  [DEBUG] Product URL: {product_url}")
-        # Use Selenium to get the price
-        price = get_price_selenium(product_url)
-        return price
     except Exception as e:
-        print(f"Error for {product_name} {features}: {e}")
-        return ''
+        # No such endpoint: stop asking for the rest of the run
+        if isinstance(e, ValueError) or getattr(getattr(e, 'response', None), 'status_code', None) == 404:
+            with _detail_lock:
+                _detail_available = False
+        log.debug("No product detail JSON for %s: %s", product_id, e)
+        return None
+    if isinstance(data, dict):
+        data = data.get('product') or data.get('data') or data
+    return json_price(data) if isinstance(data, dict) else None
+
+# Function to pick the product row matching the row's features
+def match_product(rows, features):
+    # Remove color from features for matching (assume color is last in the list)
+    match_features = features[:-1]
+    def feature_match(product):
+        name = product.get('productname', '').lower()
+        return all(str(f).lower() in name for f in match_features if f)
+    filtered = [p for p in rows if feature_match(p)]
+    if not filtered:
+        log.debug("No products matched features: %s", features)
+        return None
+    return filtered[0]
+
+# JSON row -> price text: the detail JSON, then the product page
+def get_price(product):
+    price = get_price_detail(product['_id'])
+    if price is None:
+        price = get_price_selenium(PRODUCT_URL.format(id=product['_id']))
+    return price
+
+def row_result(product, price):
+    return {'title': product.get('productname', ''), 'url': PRODUCT_URL.format(id=product['_id']), 'price': price}
+
+SITE = 'surfaceiran.com'
+# This variant only fills the price column
+URL_COLUMN = None
 
 # For each row, fill in the price for surfaceiran.com
-df['surfaceiran.com'] = df['surfaceiran.com'].astype('object')
-for idx, row in df.iterrows():
-    product_name = row['Product name']
-    features = [row['Cpu'], row['Ram'], row['SSD'], row['Color']]
-    print(f"Updating row {idx+1}: {product_name}, features: {features}")
-    price = get_surfaceiran_price(product_name, features)
-    print(f"  -> Price found: {price}")
-    df.at[idx, 'surfaceiran.com'] = price
-    time.sleep(1)  # Be polite to the server
-
-# Save the updated table back to SampleSites.xlsx
-print('Saving updated data to SampleSites.xlsx...')
-df.to_excel('SampleSites.xlsx', index=False)
-
-print('Done. Prices updated in SampleSites.xlsx.') 
\ No newline at end of file
+def scrape_rows(df):
+    names = [str(name) for name in df['Product name']]
+    distinct, failed = query_cache.prefetch('surfaceiran-api', names, fetch_short_list)
+    log.info("%s: %d distinct searches for %d rows", SITE, distinct, len(df))
+    for name, e in failed.items():
+        log.warning("Error searching surfaceiran.com for %s: %s", name, e)
+
+    executor = ThreadPoolExecutor(max_workers=PRODUCT_PAGE_WORKERS)
+    pending = {}
+    waiting = {}
+    try:
+        for idx, row in df.iterrows():
+            features = [row['Cpu'], row['Ram'], row['SSD'], row['Color']]
+            log.debug("Updating row %d: %s, features: %s", idx + 1, row['Product name'], features)
+            # A failed search is not retried for the other rows sharing its name
+            error = failed.get(query_cache.normalize_query(row['Product name']))
+            if error is None:
+                try:
+                    product = match_product(search(str(row['Product name'])), features)
+                except Exception as e:
+                    log.warning("Error searching surfaceiran.com for %s: %s", row['Product name'], e)
+                    error = failed[query_cache.normalize_query(row['Product name'])] = e
+            if error is not None:
+                yield idx, {'title': '', 'url': '', 'price': '', 'error': str(error)}
+                continue
+            if product is None:
+                yield idx, {'title': '', 'url': '', 'price': ''}
+                continue
+            price = json_price(product)
+            if price is not None:
+                log.debug("Row %d price found: %s", idx + 1, price)
+                yield idx, row_result(product, price)
+                continue
+            # Price each distinct product once, several at a time
+            future = pending.get(product['_id'])
+            if future is None:
+                future = pending[product['_id']] = executor.submit(get_price, product)
+            waiting.setdefault(future, []).append((idx, product))
+
+        for future in as_completed(waiting):
+            for idx, product in waiting[future]:
+                try:
+                    price = future.result()
+                except Exception as e:
+                    log.warning("Error fetching %s: %s", PRODUCT_URL.format(id=product['_id']), e)
+                    yield idx, dict(row_result(product, ''), error=str(e))
+                    continue
+                log.debug("Row %d price found: %s", idx + 1, price)
+                yield idx, row_result(product, price)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == '__main__':
+    sheet.run_site(SITE, URL_COLUMN, scrape_rows)
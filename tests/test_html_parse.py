@@ -0,0 +1,15 @@
+import html_parse
+
+
+def test_site_parser_ignores_www(monkeypatch):
+    monkeypatch.setattr(html_parse, 'SITE_PARSERS', {})
+    monkeypatch.setattr(html_parse, 'PARSER', 'lxml')
+    html_parse.set_site_parser('yasinrayan.com', 'html.parser')
+    assert html_parse.parser_for('https://www.yasinrayan.com/?s=pro') == 'html.parser'
+    assert html_parse.parser_for('https://micropple.ir/') == 'lxml'
+
+
+def test_parse_keeps_only_regions():
+    html = '<nav><a href="/x">menu</a></nav><div class="card"><a href="/p/1">Surface</a></div>'
+    soup = html_parse.parse(html, ['div.card'], url='https://shop.example/')
+    assert [a['href'] for a in soup.select('a')] == ['/p/1']
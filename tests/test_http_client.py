@@ -0,0 +1,15 @@
+import http_client
+
+
+def test_cache_ttl_precedence(monkeypatch):
+    monkeypatch.setattr(http_client, 'HTTP_CACHE_TTL', 0)
+    monkeypatch.setattr(http_client, 'SITE_CACHE_TTLS', {})
+    monkeypatch.setattr(http_client, 'TTL_OVERRIDE', None)
+    url = 'https://www.shop.example/product/1/'
+    assert http_client._cache_ttl(url) == 0
+    http_client.set_site_cache_ttl('www.shop.example', 600)
+    assert http_client._cache_ttl(url) == 600
+    # A request's own TTL (e.g. color pages) only applies to that request
+    assert http_client._cache_ttl(url, ttl=3600) == 3600
+    monkeypatch.setattr(http_client, 'TTL_OVERRIDE', 60)
+    assert http_client._cache_ttl(url, ttl=3600) == 60
@@ -0,0 +1,47 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import paginated_crawler
+
+CATEGORY = 'https://shop.example/category/'
+
+
+def listing(pages, per_page=3, failing=()):
+    # fetch(url) over a fake category of `pages` pages; pages in `failing` raise
+    def fetch(url, regions=None):
+        m = paginated_crawler.PAGE_NUMBER_RE.search(url)
+        page = int(m.group(1)) if m else 1
+        if page in failing:
+            raise ConnectionError(f"page {page} down")
+        items = ''.join(f'<div class="p">{page}-{i}</div>' for i in range(per_page)) if page <= pages else ''
+        links = ''.join(f'<a class="page-numbers" href="{CATEGORY}page/{n}/">{n}</a>' for n in range(2, pages + 1))
+        return BeautifulSoup(f'<div>{items}</div><nav>{links}</nav>', 'html.parser')
+    return fetch
+
+
+def parse_page(soup):
+    return [{'title': tag.get_text()} for tag in soup.select('div.p')]
+
+
+def test_crawl_walks_every_page():
+    products = paginated_crawler.crawl_categories([CATEGORY], parse_page, fetch=listing(4), incremental=False)
+    assert len(products) == 12
+
+
+def test_failed_page_fails_the_crawl():
+    with pytest.raises(ConnectionError):
+        paginated_crawler.crawl_categories([CATEGORY], parse_page, fetch=listing(4, failing={3}), incremental=False)
+    with pytest.raises(ConnectionError):
+        paginated_crawler.crawl_categories([CATEGORY], parse_page, fetch=listing(4, failing={1}), incremental=False)
+
+
+def test_failed_crawl_is_not_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(paginated_crawler, 'CATALOG_PATH', str(tmp_path))
+    with pytest.raises(ConnectionError):
+        paginated_crawler.crawl_categories([CATEGORY], parse_page, fetch=listing(4, failing={3}), incremental=True)
+    assert paginated_crawler.load_catalog(CATEGORY) is None
+    # The next incremental crawl is a full one, not a reuse of a truncated copy
+    products = paginated_crawler.crawl_categories([CATEGORY], parse_page, fetch=listing(4), incremental=True)
+    assert len(products) == 12
+    products = paginated_crawler.crawl_categories([CATEGORY], parse_page, fetch=listing(4), incremental=True)
+    assert len(products) == 12
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+import prices
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('۴۵,۰۰۰,۰۰۰ تومان', (45000000, 45000000)),
+    ('45,000,000', (45000000, 45000000)),
+    ('۱۸۶٬۶۵۲٬۰۰۰تومان', (186652000, 186652000)),
+    ('1.282.290.000 ریال', (128229000, 128229000)),
+    ('1,282,290,000 ريال', (128229000, 128229000)),
+    ('45 میلیون تومان', (45000000, 45000000)),
+    ('45.5 میلیون تومان', (45500000, 45500000)),
+    ('۴۵٫۵ میلیون تومان', (45500000, 45500000)),
+    ('45/5 میلیون', (45500000, 45500000)),
+    ('950 هزار تومان', (950000, 950000)),
+    ('1.5 میلیون ریال', (150000, 150000)),
+    # Ranges and struck-out regular prices
+    ('186,652,000 - 201,816,000 تومان', (186652000, 201816000)),
+    ('۵۰,۰۰۰,۰۰۰ تومان ۴۵,۰۰۰,۰۰۰ تومان', (45000000, 50000000)),
+    # Percentages and model numbers are not prices
+    ('15% تخفیف 45,000,000 تومان', (45000000, 45000000)),
+    ('', (None, None)),
+    (None, (None, None)),
+    (float('nan'), (None, None)),
+    ('ناموجود', (None, None)),
+])
+def test_parse_price(text, expected):
+    assert prices.parse_price(text) == expected
+
+
+def test_parse_column():
+    typed = prices.parse_column(pd.Series(['45 میلیون تومان', None, '45 میلیون تومان', 'تماس بگیرید']))
+    assert typed['min'].dtype == 'Int64'
+    assert typed['min'].tolist() == [45000000, pd.NA, 45000000, pd.NA]
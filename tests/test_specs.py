@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+import batch_match
+import site_engine
+import specs
+
+
+@pytest.mark.parametrize('title, expected', [
+    # yasinrayan: generation glued to the CPU
+    ('سرفیس پرو 10core ultra 7 ram 16gb 512gb wifi',
+     {'family': 'pro', 'generation': '10', 'cpu': 'ultra7', 'ram_gb': 16, 'ssd_gb': 512}),
+    # 'ProX Elite' is the Pro 11 CPU, not the Pro X generation
+    ('Surface ProX Elite X Plus 16GB 256GB',
+     {'family': 'pro', 'generation': None, 'ram_gb': 16, 'ssd_gb': 256}),
+    ('surface pro x sq2 16gb 256gb',
+     {'family': 'pro', 'generation': 'x', 'cpu': 'sq2'}),
+    ('سرفیس پرو 11 Snapdragon X Plus رم 16GB حافظه 256GB مشکی',
+     {'family': 'pro', 'generation': '11', 'cpu': 'xplus', 'ram_gb': 16, 'ssd_gb': 256, 'color': 'black'}),
+    ('سرفیس لپ تاپ 7 X Elite رم 32 گیگابایت 1 ترابایت پلاتینی',
+     {'family': 'laptop', 'generation': '7', 'cpu': 'xelite', 'ram_gb': 32, 'ssd_gb': 1024, 'color': 'platinum'}),
+    ('surface-pro-11-intel-ultra-7-32-512gb',
+     {'family': 'pro', 'generation': '11', 'cpu': 'ultra7', 'ram_gb': 32, 'ssd_gb': 512}),
+    ('Surface Pro 10 Core Ultra 7 64GB 1T Platinum',
+     {'generation': '10', 'ram_gb': 64, 'ssd_gb': 1024, 'color': 'platinum'}),
+    ('سرفیس پرو ۹ Core i7 رم ۱۶GB هارد ۲۵۶GB',
+     {'generation': '9', 'cpu': 'i7', 'ram_gb': 16, 'ssd_gb': 256}),
+    # Sizes and screen sizes are not generations
+    ('surface pro 8gb 256gb', {'family': 'pro', 'generation': None, 'ram_gb': 8}),
+    ('Surface Laptop 13.8 X Elite 16GB 512GB', {'family': 'laptop', 'generation': None}),
+    ('Core Ultra 7 رم 16GB هارد 512GB SSD bluetooth',
+     {'family': None, 'cpu': 'ultra7', 'ram_gb': 16, 'ssd_gb': 512, 'color': None}),
+])
+def test_extract_specs(title, expected):
+    found = specs.extract_specs(title)
+    assert {field: found[field] for field in expected} == expected
+
+
+def sheet_rows():
+    return pd.DataFrame([
+        ['surface pro 10', 'Ultra 7', '16GB', '512GB', 'Platinum'],
+        ['surface pro 11', 'X Plus', '16GB', '256GB', 'Black'],
+    ], columns=['Product name', 'Cpu', 'Ram', 'SSD', 'Color'])
+
+
+def match(products, **kwargs):
+    matches = batch_match.match_catalog(sheet_rows(), products, 'title', ['Cpu', 'Ram', 'SSD'],
+                                        site_engine.normalize, **kwargs)
+    return {idx: product and product['url'] for idx, product in matches.items()}
+
+
+def test_exact_key_beats_substring_hit():
+    products = [{'title': 'Surface Pro 10 Ultra 7 32GB 512GB', 'url': 'a'},
+                {'title': 'سرفیس پرو 10 Core Ultra 7 رم 16GB هارد 512GB', 'url': 'b'}]
+    assert match(products)[0] == 'b'
+
+
+def test_join_miss_falls_back_to_scoring():
+    products = [{'title': 'سرفیس پرو 10core ultra 7 ram 16gb 512gb wifi', 'url': 'a'},
+                {'title': 'Surface ProX Elite X Plus 16GB 256GB', 'url': 'b'}]
+    assert match(products) == {0: 'a', 1: 'b'}
+
+
+def test_all_terms_mode_ignores_the_name():
+    products = [{'title': 'Core Ultra 7 رم 16GB هارد 512GB SSD', 'url': 'a'}]
+    assert match(products, name_column=None, require_all=True) == {0: 'a', 1: None}
@@ -0,0 +1,36 @@
+import json
+
+import requests
+
+import store_api
+
+SPEC = {'site': 'shop.example', 'store_api': {}}
+
+
+def fake_get(pages, failing=()):
+    # http_client.get over a Store API product list of `pages` full pages
+    def get(url, params=None, timeout=None, **kwargs):
+        page = params['page']
+        resp = requests.Response()
+        resp.status_code = 500 if page in failing else 200
+        items = [{'name': f'Surface {page}-{i}', 'permalink': f'https://shop.example/p/{page}-{i}/'}
+                 for i in range(store_api.PER_PAGE)] if page <= pages else []
+        resp._content = json.dumps(items).encode()
+        return resp
+    return get
+
+
+def test_fetch_products_reads_every_page(monkeypatch):
+    monkeypatch.setattr(store_api.http_client, 'get', fake_get(3))
+    assert len(store_api.fetch_products(SPEC)) == 3 * store_api.PER_PAGE
+
+
+def test_failed_page_falls_back_to_html(monkeypatch):
+    monkeypatch.setattr(store_api.http_client, 'get', fake_get(3, failing={2}))
+    assert store_api.fetch_products(SPEC) is None
+
+
+def test_price_text():
+    prices = {'price': '45500000', 'currency_code': 'IRT', 'currency_minor_unit': 0}
+    assert store_api.price_text(prices) == '45,500,000 تومان'
+    assert store_api.price_text({}) == ''
@@ -0,0 +1,20 @@
+import pytest
+
+import surfaceiran_scraper
+
+
+@pytest.mark.parametrize('value, expected', [
+    (1282290000, '1,282,290,000 ريال'),
+    ('1,282,290,000', '1,282,290,000 ريال'),
+    ('1,282,290,000 ريال', '1,282,290,000 ريال'),
+    # Listed without a price: no fallback to the detail JSON or the page
+    (0, ''),
+    ('0', ''),
+    ('۰', ''),
+    ('ناموجود', ''),
+    # No price at all: the fallbacks run
+    ('', None),
+    (None, None),
+])
+def test_json_price(value, expected):
+    assert surfaceiran_scraper.json_price({'priceVal': value}) == expected
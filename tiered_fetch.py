@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+import driver_pool
+import html_parse
+import http_client
+import logs
+import metrics
+import rate_limit
+
+# Two-tier page fetcher: plain HTTP first, headless browser only when the
+# static HTML lacks the selector the caller needs (JS-rendered or bot-gated
+# pages). Escalated URLs are remembered on disk so later runs skip the static
+# attempt, and once a few URLs of the same route (host + first path segment)
+# needed the browser, new URLs on that route go straight to it as well.
+# Offline (http_client.OFFLINE) the browser is never started: the cached
+# static HTML is returned as it is, and a URL with none fails.
+
+ESCALATIONS_PATH = os.path.join(http_client.CACHE_DIR, 'browser_escalations.json')
+ESCALATE_ROUTE_AFTER = 3
+RENDER_WAIT = 30
+# Bot-challenge answers a browser can get past; any other error status
+# (404, 429/5xx after http_client's retries, ...) is raised, never escalated,
+# so a host having a bad minute is not pinned to the browser for good
+CHALLENGE_STATUSES = (403,)
+
+log = logs.get_logger(__name__)
+_lock = threading.Lock()
+_escalations = None
+
+
+def _route(url):
+    parts = urlsplit(url)
+    segment = parts.path.strip('/').split('/', 1)[0]
+    return f"{parts.netloc.lower()}/{segment}"
+
+
+def _load():
+    global _escalations
+    if _escalations is None:
+        try:
+            with open(ESCALATIONS_PATH, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            data = {}
+        _escalations = {'urls': set(data.get('urls', [])), 'routes': dict(data.get('routes', {}))}
+    return _escalations
+
+
+def _save(state):
+    os.makedirs(os.path.dirname(ESCALATIONS_PATH), exist_ok=True)
+    tmp = ESCALATIONS_PATH + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump({'urls': sorted(state['urls']), 'routes': state['routes']}, fh, ensure_ascii=False, indent=1)
+    os.replace(tmp, ESCALATIONS_PATH)
+
+
+def needs_browser(url):
+    with _lock:
+        state = _load()
+        return url in state['urls'] or state['routes'].get(_route(url), 0) >= ESCALATE_ROUTE_AFTER
+
+
+def record_escalation(url):
+    with _lock:
+        state = _load()
+        if url in state['urls']:
+            return
+        state['urls'].add(url)
+        route = _route(url)
+        state['routes'][route] = state['routes'].get(route, 0) + 1
+        _save(state)
+
+
+def render(url, wait_selector=None):
+    log.debug("Rendering in browser: %s", url)
+    site = metrics.site_of(url)
+    with driver_pool.driver() as driver, metrics.span('render', site=site):
+        rate_limit.acquire(url)
+        metrics.count('browser_renders', site=site)
+        driver.get(http_client.route(url))
+        if wait_selector:
+            try:
+                WebDriverWait(driver, RENDER_WAIT).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+            except Exception as e:
+                log.warning("%s did not appear on %s: %s", wait_selector, url, e)
+        return driver.page_source
+
+
+def fetch_html(url, required_selector, timeout=20):
+    # Returns page HTML that contains required_selector whenever either tier can provide it
+    if http_client.OFFLINE:
+        resp = http_client.get(url, timeout=timeout)
+        resp.raise_for_status()
+        return resp.text
+    if not needs_browser(url):
+        resp = http_client.get(url, timeout=timeout)
+        if resp.status_code not in CHALLENGE_STATUSES:
+            resp.raise_for_status()
+            if html_parse.has_match(resp.text, required_selector, url=url):
+                return resp.text
+        log.debug("%s missing from static HTML (status %s), escalating: %s", required_selector, resp.status_code, url)
+        metrics.count('browser_escalations', site=metrics.site_of(url))
+        record_escalation(url)
+    return render(url, wait_selector=required_selector)
+
+
+def fetch_soup(url, required_selector, timeout=20, regions=None):
+    return html_parse.parse(fetch_html(url, required_selector, timeout=timeout), regions, url=url)
@@ -0,0 +1,157 @@
+import argparse
+import os
+
+import openpyxl
+import pandas as pd
+
+import logs
+
+# Workbook I/O behind sheet.load_sheet/save_sheet. Loads read only the columns
+# a run needs; saves write only the given columns, and in an .xlsx only the
+# cells whose value changed, into the existing workbook, so the other columns,
+# formatting and widths are left as they are. The sheet can also be kept in a
+# columnar working format (.parquet or .feather, needs pyarrow) that loads and
+# saves in a fraction of the time; the Excel file is then an export.
+# usage:
+#     python workbook.py SampleSites.xlsx SampleSites.parquet   # start a working copy
+#     python workbook.py SampleSites.parquet SampleSites.xlsx   # export (changed cells only)
+
+COLUMNAR_FORMATS = ('.parquet', '.feather')
+
+log = logs.get_logger(__name__)
+
+
+def _format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return ext if ext in COLUMNAR_FORMATS else '.xlsx'
+
+
+def load(path, columns=None):
+    # columns: names to read (missing ones are skipped), None for all
+    fmt = _format(path)
+    if fmt == '.xlsx':
+        usecols = None if columns is None else (lambda name: name in set(columns))
+        return pd.read_excel(path, usecols=usecols)
+    read = pd.read_parquet if fmt == '.parquet' else pd.read_feather
+    if columns is None:
+        return read(path)
+    # Columnar files hold their schema; ask only for the columns they have
+    import pyarrow.dataset
+    stored = pyarrow.dataset.dataset(path, format=fmt.lstrip('.')).schema.names
+    return read(path, columns=[name for name in stored if name in set(columns)])
+
+
+def _cell_value(value):
+    # DataFrame value -> what openpyxl stores; blanks become empty cells
+    if isinstance(value, str):
+        return value or None
+    if value is None or pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _same(old, new):
+    return (old in (None, '') and new is None) or old == new
+
+
+def _anchor(df, name, after):
+    # Column a new column goes right after: after[name], or the one before it in df
+    if after is not None:
+        return after.get(name)
+    position = list(df.columns).index(name)
+    return df.columns[position - 1] if position else None
+
+
+def _place_columns(ws, df, columns, after):
+    # Sheet column number of each written column; missing ones are inserted
+    # after their anchor (see _anchor), or appended when it is not in the sheet
+    header = {cell.value: cell.column for cell in ws[1] if cell.value is not None}
+    for name in columns:
+        if name in header:
+            continue
+        previous = _anchor(df, name, after)
+        if previous in header:
+            col = header[previous] + 1
+            ws.insert_cols(col)
+        else:
+            col = ws.max_column + 1
+        ws.cell(row=1, column=col, value=name)
+        header = {cell.value: cell.column for cell in ws[1] if cell.value is not None}
+    return header
+
+
+def _save_xlsx(df, path, columns, after):
+    if not os.path.exists(path):
+        df.to_excel(path, index=False)
+        return len(df) * len(df.columns)
+    wb = openpyxl.load_workbook(path)
+    ws = wb.worksheets[0]
+    header = _place_columns(ws, df, columns, after)
+    changed = 0
+    for name in columns:
+        col = header[name]
+        for row, value in enumerate(df[name].tolist(), start=2):
+            cell = ws.cell(row=row, column=col)
+            value = _cell_value(value)
+            if not _same(cell.value, value):
+                cell.value = value
+                changed += 1
+    if changed:
+        tmp = f"{path}.tmp"
+        wb.save(tmp)
+        os.replace(tmp, path)
+    return changed
+
+
+def _save_columnar(df, path, columns, after, fmt):
+    # The stored table keeps the columns this run did not load
+    if os.path.exists(path):
+        table = load(path)
+        for name in columns:
+            if name in table.columns:
+                table[name] = df[name].values
+                continue
+            previous = _anchor(df, name, after)
+            at = list(table.columns).index(previous) + 1 if previous in table.columns else len(table.columns)
+            table.insert(at, name, df[name].values)
+    else:
+        table = df
+    tmp = f"{path}.tmp"
+    if fmt == '.parquet':
+        table.to_parquet(tmp, index=False)
+    else:
+        table.reset_index(drop=True).to_feather(tmp)
+    os.replace(tmp, path)
+    return len(table) * len(columns)
+
+
+def save(df, path, columns=None, after=None):
+    # Write df's columns (None for all) into path; returns the cells written.
+    # after: {new column: column it follows in the file, None to append}
+    columns = list(df.columns) if columns is None else [name for name in columns if name in df.columns]
+    fmt = _format(path)
+    if fmt == '.xlsx':
+        written = _save_xlsx(df, path, columns, after)
+    else:
+        written = _save_columnar(df, path, columns, after, fmt)
+    log.debug("%s: wrote %d cells in %d columns", path, written, len(columns))
+    return written
+
+
+def convert(source, target):
+    # Whole sheet from one format to another; into an existing .xlsx only
+    # changed cells are written
+    return save(load(source), target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert the sheet between Excel and a columnar working format.')
+    parser.add_argument('source')
+    parser.add_argument('target')
+    args = parser.parse_args(argv)
+    written = convert(args.source, args.target)
+    print(f"{args.target}: {written} cells written")
+
+
+if __name__ == '__main__':
+    main()